@@ -26,8 +26,9 @@ from app.utils.file_handler import (
 from app.utils.image_processor import (
     validate_image_file,
     get_image_info,
-    create_thumbnail,
-    get_thumbnail_path
+    create_thumbnail_async,
+    get_thumbnail_path,
+    remove_thumbnail_buckets
 )
 from app.utils.security import (
     validate_file_content,
@@ -105,7 +106,7 @@ async def upload_image(
         if not validate_file_type(filename):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"サポートされていないファイル形式です。許可される形式: {', '.join(ALLOWED_EXTENSIONS)}"
+                detail=f"サポートされていないファイル形式です。許可される形式: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
             )
         
         # =================================
@@ -124,7 +125,7 @@ async def upload_image(
         
         # 画像用サブディレクトリを作成
         images_dir = os.path.join(UPLOAD_DIR, "images")
-        file_path, unique_filename = await save_uploaded_file(file, images_dir)
+        file_path, unique_filename, file_hash = await save_uploaded_file(file, images_dir)
         
         logger.info(f"ファイル保存完了: {file_path}")
         
@@ -145,7 +146,7 @@ async def upload_image(
             )
         
         # 包括的なファイル内容検証
-        validation_result = validate_file_content(file_path)
+        validation_result = await validate_file_content(file_path, file_hash=file_hash)
         if not validation_result['valid']:
             # 危険なファイルを削除
             try:
@@ -173,7 +174,7 @@ async def upload_image(
         # 5. 画像検証
         # =================================
         
-        if not validate_image_file(file_path):
+        if not validate_image_file(file_path, strict=True):
             # 無効な画像ファイルを削除
             try:
                 os.remove(file_path)
@@ -240,7 +241,7 @@ async def upload_image(
             thumbnail_path = get_thumbnail_path(file_path)
             
             # サムネイル作成
-            if create_thumbnail(file_path, thumbnail_path):
+            if await create_thumbnail_async(file_path, thumbnail_path):
                 logger.info(f"サムネイル生成完了: {thumbnail_path}")
                 
                 # データベースにサムネイルパスを更新
@@ -378,6 +379,7 @@ async def delete_image(
         thumbnail_path = get_thumbnail_path(image.file_path)
         if os.path.exists(thumbnail_path):
             os.remove(thumbnail_path)
+        remove_thumbnail_buckets(image.file_path)
         
         # データベースから削除
         db.delete(image)
@@ -176,6 +176,10 @@ async def scrape_multiple_urls(request: BulkScrapingRequest):
 
             for url, content in zip(urls, contents):
                 try:
+                    # fetch_multipleはURLごとの想定外の例外を結果として返す
+                    if isinstance(content, BaseException):
+                        raise content
+
                     # robots.txtチェック
                     if request.respect_robots and not content.robots_allowed:
                         results.append(BulkScrapingResult(
@@ -9,9 +9,15 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 # 条件付きインポート
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
     from app.services.threat_scorer import ThreatScorer, get_threat_scorer
     from app.schemas.analysis import (
@@ -35,8 +41,12 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
-# ルーター初期化
-router = APIRouter(prefix="/threat-scoring", tags=["脅威度スコアリング"])
+# ルーター初期化（orjsonがあればレスポンスのシリアライズに使用）
+router = APIRouter(
+    prefix="/threat-scoring",
+    tags=["脅威度スコアリング"],
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+)
 
 # 統計データ（インメモリ - 本番環境ではRedisやDBを使用）
 threat_stats = {
@@ -304,10 +314,10 @@ async def get_threat_scoring_config(
         }
 
         return ThreatScoreConfig(
-            weights=scorer.weights,
-            domain_weights=scorer.domain_weights,
-            ai_weights=scorer.ai_weights,
-            other_weights=scorer.other_weights,
+            weights=dict(scorer.weights),
+            domain_weights=dict(scorer.domain_weights),
+            ai_weights=dict(scorer.ai_weights),
+            other_weights=dict(scorer.other_weights),
             threshold_settings=threshold_settings
         )
 
@@ -3,7 +3,7 @@ ABDSシステム - アプリケーション設定（簡略版）
 """
 
 import os
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 
 
 class Settings:
@@ -21,7 +21,10 @@ class Settings:
     # ファイル設定
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
-    ALLOWED_EXTENSIONS: List[str] = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
+    ALLOWED_EXTENSIONS: FrozenSet[str] = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp"})
+
+    # サムネイル生成のワーカープロセス数（uvicornワーカーごとに起動される）
+    THUMBNAIL_WORKERS: int = int(os.getenv("THUMBNAIL_WORKERS", "2"))
 
     # CORS設定
     ALLOWED_HOSTS: List[str] = [
@@ -17,6 +17,12 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 import uvicorn
 
 from app.core.config import settings
+from app.utils.file_handler import ensure_directory
+from app.utils.image_processor import shutdown_thumbnail_pool
+from app.services import IMAGE_SEARCH_AVAILABLE
+
+if IMAGE_SEARCH_AVAILABLE:
+    from app.services.image_search import close_image_search_services
 
 # ログ設定
 logging.basicConfig(
@@ -37,9 +43,10 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Debug mode: {settings.DEBUG}")
 
-    # アップロードディレクトリの作成
+    # アップロードディレクトリの作成（リクエスト処理中の作成確認を省くため起動時にまとめて作成）
     upload_dir = Path(settings.UPLOAD_DIR)
-    upload_dir.mkdir(exist_ok=True)
+    for directory in (upload_dir, upload_dir / "images", upload_dir / "thumbnails"):
+        ensure_directory(str(directory))
     logger.info(f"Upload directory created: {upload_dir.absolute()}")
 
     # ここで必要に応じてデータベース接続や他の初期化処理を行う
@@ -50,6 +57,9 @@ async def lifespan(app: FastAPI):
 
     # 終了時の処理
     logger.info(f"📴 {settings.PROJECT_NAME} shutting down...")
+    shutdown_thumbnail_pool()
+    if IMAGE_SEARCH_AVAILABLE:
+        await close_image_search_services()
     # await database.disconnect()
     # await redis_client.close()
 
@@ -5,22 +5,48 @@ Google画像検索とSerpAPIを使用した類似画像検索
 
 import os
 import base64
+import json
 import logging
 import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, AsyncIterator
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 
 import httpx
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-import serpapi
 
 from app.core.config import settings
 from app.utils.rate_limiter import RateLimiter
 
+# 条件付きインポート - パッケージが利用可能な場合のみインポート
+try:
+    import aiofiles
+    AIOFILES_AVAILABLE = True
+except ImportError:
+    AIOFILES_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  httpxのHTTP/2サポートに必要
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import brotli  # noqa: F401  httpxのbrotli展開に必要
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +64,49 @@ class SearchResult:
     file_size: Optional[str] = None
 
 
+if MSGSPEC_AVAILABLE:
+    class SerpAPIInlineImage(msgspec.Struct):
+        """SerpAPI inline_images の要素（使用するフィールドのみ）"""
+        title: str = ''
+        original: str = ''
+        thumbnail: str = ''
+        source: str = ''
+        original_width: Optional[int] = None
+        original_height: Optional[int] = None
+
+    class SerpAPIVisualMatch(msgspec.Struct):
+        """SerpAPI visual_matches の要素（使用するフィールドのみ）"""
+        title: str = ''
+        link: str = ''
+        thumbnail: str = ''
+        source: str = ''
+
+    class SerpAPISearchMetadata(msgspec.Struct):
+        """SerpAPI search_metadata（非同期検索のステータス確認用）"""
+        id: str = ''
+        status: str = ''
+
+    class SerpAPIResponse(msgspec.Struct):
+        """SerpAPI逆画像検索レスポンス"""
+        search_metadata: SerpAPISearchMetadata = msgspec.field(default_factory=SerpAPISearchMetadata)
+        error: str = ''
+        inline_images: List[SerpAPIInlineImage] = []
+        visual_matches: List[SerpAPIVisualMatch] = []
+
+
+# 画像読み込みのチャンクサイズ（Base64の4文字境界に揃うよう3の倍数）
+IMAGE_READ_CHUNK_SIZE = 3 * 64 * 1024
+
+
+def _read_and_encode_base64(image_path: str, hasher=None) -> str:
+    """画像を同期的に読み込んでBase64エンコード（スレッドプール実行用）"""
+    with open(image_path, 'rb') as image_file:
+        data = image_file.read()
+    if hasher is not None:
+        hasher.update(data)
+    return base64.b64encode(data).decode('ascii')
+
+
 class ImageSearchService(ABC):
     """画像検索サービスの抽象基底クラス"""
     
@@ -71,17 +140,80 @@ class ImageSearchService(ABC):
             SearchAPIError: 検索API呼び出しに失敗した場合
         """
         pass
+
+    async def search_batch(
+        self,
+        image_paths: List[str],
+        max_results: int = 10
+    ) -> List[Union[List[SearchResult], Exception]]:
+        """
+        複数画像をまとめて検索
+
+        API側に一括検索の仕組みがないサービスでは、固定数のワーカーで
+        search_similar_images を実行する。
+
+        Args:
+            image_paths: 検索対象の画像パスのリスト
+            max_results: 画像あたりの最大結果数
+
+        Returns:
+            image_pathsと同じ順序の検索結果（失敗した画像は例外オブジェクト）
+        """
+        return await search_images_bounded(self, image_paths, max_results)
     
     @abstractmethod
     def get_service_name(self) -> str:
         """サービス名を取得"""
         pass
+
+    async def aclose(self):
+        """保持しているHTTPクライアント等を閉じる（保持しないサービスでは何もしない）"""
+        pass
+
+    @staticmethod
+    def _is_remote_image(image_path: str) -> bool:
+        """画像パスが公開URLかどうか（URLならファイル読み込み・エンコード不要）"""
+        return image_path.startswith(('http://', 'https://'))
     
-    def _encode_image_to_base64(self, image_path: str) -> str:
-        """画像をBase64エンコード"""
+    async def _stream_image(self, image_path: str) -> AsyncIterator[bytes]:
+        """画像ファイルを固定サイズのチャンクで非同期に読み込む"""
+        async with aiofiles.open(image_path, 'rb') as image_file:
+            while True:
+                chunk = await image_file.read(IMAGE_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+    async def _encode_image_to_base64(self, image_path: str, hasher=None) -> str:
+        """
+        画像をBase64エンコード（イベントループをブロックしない）
+
+        Args:
+            image_path: 画像パス
+            hasher: hashlib互換のハッシュオブジェクト。指定した場合は
+                エンコードと同じ読み込みパスでupdateされる（再読み込み不要）
+
+        Returns:
+            Base64文字列
+        """
         try:
-            with open(image_path, 'rb') as image_file:
-                return base64.b64encode(image_file.read()).decode('utf-8')
+            if AIOFILES_AVAILABLE:
+                encoded_parts = []
+                pending = b''
+                async for chunk in self._stream_image(image_path):
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    if pending:
+                        chunk = pending + chunk
+                    # 3バイト境界までをエンコードし、端数は次のチャンクに繰り越す
+                    boundary = len(chunk) - len(chunk) % 3
+                    encoded_parts.append(base64.b64encode(chunk[:boundary]))
+                    pending = chunk[boundary:]
+                encoded_parts.append(base64.b64encode(pending))
+                return b''.join(encoded_parts).decode('ascii')
+
+            # aiofilesが利用できない場合はスレッドプールで読み込み・エンコード
+            return await asyncio.to_thread(_read_and_encode_base64, image_path, hasher)
         except Exception as e:
             logger.error(f"画像のBase64エンコードに失敗: {e}")
             raise SearchAPIError(f"画像エンコードエラー: {e}")
@@ -100,6 +232,15 @@ class GoogleImageSearchService(ImageSearchService):
         super().__init__(api_key, rate_limit)
         self.search_engine_id = search_engine_id
         self.service = None
+
+        # リクエストごとに変わらない検索パラメータ
+        self._base_params = MappingProxyType({
+            "cx": search_engine_id,
+            "searchType": "image",
+            "safe": "medium",
+            # 使用するフィールドのみ返させる（部分レスポンス）
+            "fields": "items(title,link,displayLink,image(thumbnailLink,width,height,byteSize))",
+        })
         
     def _get_service(self):
         """Google Custom Search サービスを取得"""
@@ -129,8 +270,9 @@ class GoogleImageSearchService(ImageSearchService):
             raise RateLimitExceededError("Google検索APIのレート制限に達しました")
         
         try:
-            # 画像をBase64エンコード
-            image_base64 = self._encode_image_to_base64(image_path)
+            # 画像をBase64エンコード（公開URLの場合は不要）
+            if not self._is_remote_image(image_path):
+                image_base64 = await self._encode_image_to_base64(image_path)
             
             # Google Custom Search API呼び出し
             service = self._get_service()
@@ -151,11 +293,9 @@ class GoogleImageSearchService(ImageSearchService):
             search_query = "similar image"
             
             response = service.cse().list(
+                **self._base_params,
                 q=search_query,
-                cx=self.search_engine_id,
-                searchType='image',
-                num=min(max_results, 10),
-                safe='medium'
+                num=min(max_results, 10)
             ).execute()
             
             items = response.get('items', [])
@@ -202,10 +342,50 @@ class GoogleImageSearchService(ImageSearchService):
 
 class SerpAPISearchService(ImageSearchService):
     """SerpAPIを使用した画像検索サービス"""
-    
+
+    SEARCH_URL = "https://serpapi.com/search.json"
+    ARCHIVE_URL = "https://serpapi.com/searches/{search_id}.json"
+
+    # 一括検索の設定
+    BATCH_SIZE = 32             # 一度に投入する検索数
+    BATCH_POLL_INTERVAL = 1.0   # 検索アーカイブのポーリング間隔（秒）
+    BATCH_POLL_TIMEOUT = 120.0  # 1件あたりの結果待ちタイムアウト（秒）
+
+    # 非同期検索の投入・ポーリング時にjson_restrictorへ追加するフィールド（検索ID・ステータス・エラー）
+    STATUS_RESTRICTOR_FIELDS = ",search_metadata,error"
+
     def __init__(self, api_key: str, rate_limit: int = 100):
         super().__init__(api_key, rate_limit)
-        
+        self.client: Optional[httpx.AsyncClient] = None
+
+        # リクエストごとに変わらない検索パラメータ
+        self._base_params = MappingProxyType({
+            "engine": "google_reverse_image",
+            "api_key": api_key,
+            # 解析で使用するフィールドのみ返させる
+            "json_restrictor": (
+                "inline_images[].{title,original,thumbnail,source,original_width,original_height},"
+                "visual_matches[].{title,link,thumbnail,source}"
+            ),
+        })
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """SerpAPI用の共有HTTPクライアントを取得"""
+        if self.client is None:
+            # 大きなJSONレスポンスを圧縮して受け取る（httpxが透過的に展開する）
+            self.client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=60.0,
+                headers={"Accept-Encoding": "br, gzip" if BROTLI_AVAILABLE else "gzip"}
+            )
+        return self.client
+
+    async def aclose(self):
+        """HTTPクライアントを閉じる"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
     async def search_similar_images(
         self, 
         image_path: str, 
@@ -219,68 +399,14 @@ class SerpAPISearchService(ImageSearchService):
             raise RateLimitExceededError("SerpAPIのレート制限に達しました")
         
         try:
-            # 画像をBase64エンコード
-            image_base64 = self._encode_image_to_base64(image_path)
-            
             # SerpAPI検索パラメータ
-            params = {
-                "engine": "google_reverse_image",
-                "image_data": image_base64,
-                "api_key": self.api_key,
-                "num": min(max_results, 100)
-            }
+            params = await self._build_params(image_path, max_results)
             
             # SerpAPI呼び出し
-            search = serpapi.GoogleSearch(params)
-            response = search.get_dict()
-            
-            results = []
-            
-            # 逆画像検索結果を処理
-            inline_images = response.get('inline_images', [])
+            http_response = await self._get_client().get(self.SEARCH_URL, params=params)
+            http_response.raise_for_status()
             
-            for i, item in enumerate(inline_images):
-                try:
-                    result = SearchResult(
-                        title=item.get('title', ''),
-                        url=item.get('original', ''),
-                        thumbnail_url=item.get('thumbnail', ''),
-                        source_domain=self._extract_domain_from_url(item.get('source', '')),
-                        similarity_score=1.0 - (i * 0.05),  # 順位ベースの仮スコア
-                        width=item.get('original_width'),
-                        height=item.get('original_height')
-                    )
-                    results.append(result)
-                    
-                    if len(results) >= max_results:
-                        break
-                        
-                except Exception as e:
-                    logger.warning(f"SerpAPI結果の解析でエラー: {e}")
-                    continue
-            
-            # 類似画像検索結果も処理
-            visual_matches = response.get('visual_matches', [])
-            
-            for i, item in enumerate(visual_matches):
-                if len(results) >= max_results:
-                    break
-                    
-                try:
-                    result = SearchResult(
-                        title=item.get('title', ''),
-                        url=item.get('link', ''),
-                        thumbnail_url=item.get('thumbnail', ''),
-                        source_domain=self._extract_domain_from_url(item.get('source', '')),
-                        similarity_score=0.8 - (i * 0.05),  # 視覚的一致の仮スコア
-                        width=None,
-                        height=None
-                    )
-                    results.append(result)
-                    
-                except Exception as e:
-                    logger.warning(f"SerpAPI視覚的一致結果の解析でエラー: {e}")
-                    continue
+            _, _, results = self._parse_response(http_response.content, max_results)
             
             logger.info(f"SerpAPI検索完了: {len(results)}件の結果")
             return results
@@ -289,8 +415,213 @@ class SerpAPISearchService(ImageSearchService):
             logger.error(f"SerpAPI検索処理中にエラー: {e}")
             raise SearchAPIError(f"SerpAPI検索エラー: {e}")
     
+    async def search_batch(
+        self,
+        image_paths: List[str],
+        max_results: int = 10
+    ) -> List[Union[List[SearchResult], Exception]]:
+        """
+        SerpAPIの非同期検索（async=true）で複数画像をまとめて検索
+
+        BATCH_SIZE件ずつ検索を投入してすぐに検索IDを受け取り、結果は
+        検索アーカイブから並行して取得する。1件ずつ結果を待つ場合と比べて
+        往復待ち時間がバッチ単位に集約される。
+        """
+        results: List[Union[List[SearchResult], Exception]] = []
+
+        for start in range(0, len(image_paths), self.BATCH_SIZE):
+            batch = image_paths[start:start + self.BATCH_SIZE]
+
+            search_ids = await asyncio.gather(
+                *(self._submit_async_search(path, max_results) for path in batch),
+                return_exceptions=True
+            )
+
+            async def collect(search_id):
+                if isinstance(search_id, Exception):
+                    return search_id
+                try:
+                    return await self._fetch_archived_search(search_id, max_results)
+                except Exception as e:
+                    return e
+
+            results.extend(await asyncio.gather(*(collect(sid) for sid in search_ids)))
+
+        failed = sum(1 for r in results if isinstance(r, Exception))
+        logger.info(f"SerpAPI一括検索完了: {len(results) - failed}件成功, {failed}件失敗")
+        return results
+
+    async def _build_params(self, image_path: str, max_results: int) -> Dict[str, Any]:
+        """検索リクエストのパラメータを生成"""
+        params = {
+            **self._base_params,
+            "num": min(max_results, 100)
+        }
+
+        if self._is_remote_image(image_path):
+            # 公開URLの画像はそのまま渡す（読み込み・エンコード不要）
+            params["image_url"] = image_path
+        else:
+            # 画像をBase64エンコード
+            params["image_data"] = await self._encode_image_to_base64(image_path)
+
+        return params
+
+    async def _submit_async_search(self, image_path: str, max_results: int) -> str:
+        """async=trueで検索を投入し、検索IDを返す"""
+        if not await self.rate_limiter.acquire():
+            raise RateLimitExceededError("SerpAPIのレート制限に達しました")
+
+        try:
+            params = await self._build_params(image_path, max_results)
+            params["async"] = "true"
+            # 検索IDを受け取るため、search_metadataを返却対象に含める
+            params["json_restrictor"] += self.STATUS_RESTRICTOR_FIELDS
+
+            http_response = await self._get_client().get(self.SEARCH_URL, params=params)
+            http_response.raise_for_status()
+            return http_response.json()["search_metadata"]["id"]
+
+        except Exception as e:
+            logger.error(f"SerpAPI非同期検索の投入に失敗: {e}")
+            raise SearchAPIError(f"SerpAPI検索エラー: {e}")
+
+    async def _fetch_archived_search(self, search_id: str, max_results: int) -> List[SearchResult]:
+        """検索アーカイブをポーリングして結果を取得"""
+        url = self.ARCHIVE_URL.format(search_id=search_id)
+        params = {
+            "api_key": self.api_key,
+            "json_restrictor": self._base_params["json_restrictor"] + self.STATUS_RESTRICTOR_FIELDS,
+        }
+        deadline = time.monotonic() + self.BATCH_POLL_TIMEOUT
+
+        while True:
+            http_response = await self._get_client().get(url, params=params)
+            http_response.raise_for_status()
+
+            status, error, results = self._parse_response(http_response.content, max_results)
+            if status == "Success":
+                return results
+            if status == "Error":
+                raise SearchAPIError(f"SerpAPI検索エラー: {error or search_id}")
+
+            if time.monotonic() >= deadline:
+                raise SearchAPIError(f"SerpAPI検索結果の取得がタイムアウトしました: {search_id}")
+            await asyncio.sleep(self.BATCH_POLL_INTERVAL)
+
     def get_service_name(self) -> str:
         return "SerpAPI"
+
+    def _parse_response(self, content: bytes, max_results: int) -> Tuple[str, str, List[SearchResult]]:
+        """
+        SerpAPIレスポンス本文を解析
+        
+        msgspecが利用できる場合はバイト列から型付き構造体へ直接デコードし、
+        中間の辞書を作らない
+        
+        Returns:
+            (検索ステータス, エラーメッセージ, SearchResultのリスト)
+        """
+        if MSGSPEC_AVAILABLE:
+            try:
+                parsed = msgspec.json.decode(content, type=SerpAPIResponse)
+                return (
+                    parsed.search_metadata.status,
+                    parsed.error,
+                    self._parse_response_typed(parsed, max_results)
+                )
+            except msgspec.ValidationError as e:
+                # 想定外の型が含まれる場合は辞書ベースの解析にフォールバック
+                logger.debug(f"SerpAPIレスポンスの型変換に失敗: {e}")
+
+        response = json.loads(content)
+        return (
+            response.get("search_metadata", {}).get("status", ''),
+            response.get("error", ''),
+            self._parse_response_dict(response, max_results)
+        )
+
+    def _parse_response_typed(self, parsed: 'SerpAPIResponse', max_results: int) -> List[SearchResult]:
+        """msgspecでデコード済みの型付き構造体を解析"""
+        results = []
+
+        # 逆画像検索結果を処理
+        for i, item in enumerate(parsed.inline_images[:max_results]):
+            results.append(SearchResult(
+                title=item.title,
+                url=item.original,
+                thumbnail_url=item.thumbnail,
+                source_domain=self._extract_domain_from_url(item.source),
+                similarity_score=1.0 - (i * 0.05),  # 順位ベースの仮スコア
+                width=item.original_width,
+                height=item.original_height
+            ))
+
+        # 類似画像検索結果も処理
+        for i, item in enumerate(parsed.visual_matches[:max_results - len(results)]):
+            results.append(SearchResult(
+                title=item.title,
+                url=item.link,
+                thumbnail_url=item.thumbnail,
+                source_domain=self._extract_domain_from_url(item.source),
+                similarity_score=0.8 - (i * 0.05),  # 視覚的一致の仮スコア
+                width=None,
+                height=None
+            ))
+
+        return results
+
+    def _parse_response_dict(self, response: Dict[str, Any], max_results: int) -> List[SearchResult]:
+        """辞書のまま解析（msgspecが利用できない場合）"""
+        results = []
+
+        # 逆画像検索結果を処理
+        inline_images = response.get('inline_images', [])
+
+        for i, item in enumerate(inline_images):
+            try:
+                result = SearchResult(
+                    title=item.get('title', ''),
+                    url=item.get('original', ''),
+                    thumbnail_url=item.get('thumbnail', ''),
+                    source_domain=self._extract_domain_from_url(item.get('source', '')),
+                    similarity_score=1.0 - (i * 0.05),  # 順位ベースの仮スコア
+                    width=item.get('original_width'),
+                    height=item.get('original_height')
+                )
+                results.append(result)
+
+                if len(results) >= max_results:
+                    break
+
+            except Exception as e:
+                logger.warning(f"SerpAPI結果の解析でエラー: {e}")
+                continue
+
+        # 類似画像検索結果も処理
+        visual_matches = response.get('visual_matches', [])
+
+        for i, item in enumerate(visual_matches):
+            if len(results) >= max_results:
+                break
+
+            try:
+                result = SearchResult(
+                    title=item.get('title', ''),
+                    url=item.get('link', ''),
+                    thumbnail_url=item.get('thumbnail', ''),
+                    source_domain=self._extract_domain_from_url(item.get('source', '')),
+                    similarity_score=0.8 - (i * 0.05),  # 視覚的一致の仮スコア
+                    width=None,
+                    height=None
+                )
+                results.append(result)
+
+            except Exception as e:
+                logger.warning(f"SerpAPI視覚的一致結果の解析でエラー: {e}")
+                continue
+
+        return results
     
     def _extract_domain_from_url(self, url: str) -> str:
         """URLからドメインを抽出"""
@@ -326,6 +657,9 @@ class RateLimitExceededError(SearchAPIError):
 def create_image_search_service(service_type: str = "serpapi") -> ImageSearchService:
     """
     画像検索サービスのファクトリー関数
+
+    同一プロセス内ではservice_typeごとに同じインスタンスを返すため、
+    HTTP接続プールとレート制限がタスク間で共有される。
     
     Args:
         service_type: "google" または "serpapi"
@@ -337,7 +671,31 @@ def create_image_search_service(service_type: str = "serpapi") -> ImageSearchSer
         ValueError: 無効なservice_type
         SearchAPIError: API設定エラー
     """
-    if service_type.lower() == "google":
+    key = service_type.lower()
+    service = _image_search_services.get(key)
+    if service is None:
+        service = _image_search_services[key] = _create_image_search_service(key)
+    return service
+
+
+async def close_image_search_services() -> None:
+    """キャッシュ済みの検索サービスを閉じて破棄（アプリケーション終了時に呼び出す）"""
+    services = list(_image_search_services.values())
+    _image_search_services.clear()
+    for service in services:
+        try:
+            await service.aclose()
+        except Exception as e:
+            logger.warning(f"{service.get_service_name()}のクローズに失敗: {e}")
+
+
+# service_type（小文字）ごとに生成した検索サービス（プロセス内で共有）
+_image_search_services: Dict[str, ImageSearchService] = {}
+
+
+def _create_image_search_service(service_type: str) -> ImageSearchService:
+    """service_type（小文字）に対応する検索サービスを生成"""
+    if service_type == "google":
         api_key = getattr(settings, 'GOOGLE_API_KEY', None)
         search_engine_id = getattr(settings, 'GOOGLE_SEARCH_ENGINE_ID', None)
         
@@ -350,7 +708,7 @@ def create_image_search_service(service_type: str = "serpapi") -> ImageSearchSer
             rate_limit=100
         )
         
-    elif service_type.lower() == "serpapi":
+    elif service_type == "serpapi":
         api_key = getattr(settings, 'SERPAPI_KEY', None)
         
         if not api_key:
@@ -365,6 +723,67 @@ def create_image_search_service(service_type: str = "serpapi") -> ImageSearchSer
         raise ValueError(f"無効なservice_type: {service_type}")
 
 
+# =================================
+# 一括検索
+# =================================
+
+async def search_images_bounded(
+    search_service: ImageSearchService,
+    image_paths: List[str],
+    max_results: int = 20,
+    concurrency: int = 32,
+    queue_size: int = 256
+) -> List[Union[List[SearchResult], Exception]]:
+    """
+    固定数のワーカーで複数画像を検索
+
+    入力数に関わらずタスク数・同時接続数・キューに載る件数が上限付きになるため、
+    大量の画像をasyncio.gatherで一斉に投入する場合と異なりメモリが増え続けない。
+
+    Args:
+        search_service: 使用する検索サービス
+        image_paths: 検索対象の画像パスのリスト
+        max_results: 画像あたりの最大結果数
+        concurrency: 同時に実行するワーカー数
+        queue_size: キューの最大長
+
+    Returns:
+        image_pathsと同じ順序の検索結果（失敗した画像は例外オブジェクト）
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    results: List[Union[List[SearchResult], Exception]] = [None] * len(image_paths)
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                index, image_path = item
+                try:
+                    results[index] = await search_service.search_similar_images(
+                        image_path, max_results
+                    )
+                except Exception as e:
+                    logger.warning(f"画像検索に失敗: {image_path}: {e}")
+                    results[index] = e
+            finally:
+                queue.task_done()
+
+    workers = [
+        asyncio.create_task(worker())
+        for _ in range(max(1, min(concurrency, len(image_paths))))
+    ]
+
+    for item in enumerate(image_paths):
+        await queue.put(item)
+    for _ in workers:
+        await queue.put(None)
+
+    await asyncio.gather(*workers)
+    return results
+
+
 # =================================
 # Celeryタスク（コメント実装）
 # =================================
@@ -401,6 +820,8 @@ def create_image_search_service(service_type: str = "serpapi") -> ImageSearchSer
 #         search_service = create_image_search_service(service_type)
 #         
 #         # 3. 画像検索を実行
+#         #    複数画像をまとめて処理する場合は search_images_bounded を使い、
+#         #    asyncio.gather で全件を一斉に投入しないこと
 #         results = await search_service.search_similar_images(
 #             image_path=image.file_path,
 #             max_results=20
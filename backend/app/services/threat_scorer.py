@@ -3,58 +3,598 @@ ABDSシステム - 脅威度スコアリングサービス
 ドメイン信頼度、AI分析結果、その他要因を統合した脅威度評価
 """
 
+import bisect
+import functools
+import hashlib
+import json
 import logging
 import math
-from datetime import datetime, timedelta
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import urlparse
 
+# 条件付きインポート - パッケージが利用可能な場合のみインポート
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps(obj: Any) -> bytes:
+    """キー順を固定してJSONバイト列に変換"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY, default=str)
+    return json.dumps(obj, sort_keys=True, default=str, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """JSONバイト列を復元"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# ドメイン年齢（日数）のしきい値と対応スコア
+# bisect_left(_AGE_THRESHOLDS, age_days) が _AGE_SCORES の添字になる
+_AGE_THRESHOLDS = (30, 180, 365, 365 * 2, 365 * 5)
+_AGE_SCORES = (90.0, 80.0, 60.0, 40.0, 20.0, 10.0)
+
+# 検索順位のしきい値と対応スコア（3位以内: 10.0 〜 50位超: 80.0）
+_RANKING_THRESHOLDS = (3, 10, 20, 50)
+_RANKING_SCORES = (10.0, 25.0, 40.0, 60.0, 80.0)
+
+# コンテンツ類似度のしきい値と対応スコア（bisect_right: 0.3未満: 85.0 〜 0.9以上: 20.0）
+_SIMILARITY_THRESHOLDS = (0.3, 0.5, 0.7, 0.9)
+_SIMILARITY_SCORES = (85.0, 70.0, 50.0, 35.0, 20.0)
+
+# 最終更新からの日数のしきい値と対応スコア（7日以内: 30.0 〜 1年超: 85.0）
+_UPDATE_THRESHOLDS = (7, 30, 90, 365)
+_UPDATE_SCORES = (30.0, 40.0, 55.0, 70.0, 85.0)
+
+# Alexaランクのしきい値と対応スコア（1万位以内: 10.0 〜 100万位超: 60.0）
+_TRAFFIC_THRESHOLDS = (10000, 100000, 1000000)
+_TRAFFIC_SCORES = (10.0, 25.0, 40.0, 60.0)
+
+# シェア数を合計するSNS
+_SOCIAL_KEYS = ('facebook_shares', 'twitter_shares', 'linkedin_shares')
+
+# シェア数合計のしきい値と対応スコア（10以下: 70.0 〜 1000超: 20.0）
+_SHARE_THRESHOLDS = (10, 100, 1000)
+_SHARE_SCORES = (70.0, 50.0, 35.0, 20.0)
+
+# CNAMEに含まれていれば信頼度を上げるCDN/セキュリティサービス
+_SECURITY_PROVIDERS = ('cloudflare', 'akamai', 'fastly', 'amazon')
+
+# 信頼できるSSL証明書発行者
+_TRUSTED_ISSUERS = ("let's encrypt", 'digicert', 'symantec', 'comodo', 'godaddy')
+
+
+def _build_automaton(words: Tuple[str, ...]) -> Any:
+    """部分文字列集合からAho-Corasickオートマトンを構築（未導入時はNone）"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+_ISSUER_AC = _build_automaton(_TRUSTED_ISSUERS)
+_SECURITY_PROVIDER_AC = _build_automaton(_SECURITY_PROVIDERS)
+
+
+# 脅威レベルごとの推奨アクション
+_RECOMMENDATIONS = MappingProxyType({
+    'HIGH': (
+        '即座に詳細調査を実施してください',
+        '著作権侵害の可能性があります',
+        '法的措置を検討してください'
+    ),
+    'MEDIUM': (
+        '追加の確認を推奨します',
+        'ドメイン所有者に連絡を検討してください',
+        '継続的な監視を設定してください'
+    ),
+    'LOW': (
+        '定期的な監視で十分です',
+        '必要に応じて追加調査を検討してください'
+    ),
+})
+_DEFAULT_RECOMMENDATIONS = ('現時点では特別な対応は不要です',)
+
+# バッチ集計の精度指定とNumPyのdtype名
+_BATCH_DTYPES = MappingProxyType({'fp64': 'float64', 'fp32': 'float32'})
+
+# スコア計算に使うAI分析の項目
+_AI_SECTIONS = ('abuse_detection', 'copyright_infringement', 'commercial_use', 'content_modification')
+
+# AI分析のカテゴリ分類キーワード（先頭の段階から順に判定）
+_RISK_LEVELS = (('高', 'high'), ('中', 'medium'))
+_COMMERCIAL_LEVELS = (('無許可', 'unauthorized'), ('商用', 'commercial'))
+_MODIFICATION_LEVELS = (('大幅', 'major'), ('軽微', 'minor'))
+
+# 段階ごとのスコア（末尾はどの段階にも該当しない場合）
+_ABUSE_SCORES = (90.0, 60.0, 20.0)
+_COPYRIGHT_SCORES = (85.0, 55.0, 15.0)
+_COMMERCIAL_SCORES = (70.0, 50.0, 20.0)
+_MODIFICATION_SCORES = (70.0, 40.0, 20.0)
+
+
+# リスク要因のビット（ラベルはビット順に出力）
+_RISK_NEW_DOMAIN = 1 << 0
+_RISK_NO_SSL = 1 << 1
+_RISK_HIGH_ABUSE = 1 << 2
+_RISK_COPYRIGHT = 1 << 3
+_RISK_LOW_RANKING = 1 << 4
+_RISK_LOW_SIMILARITY = 1 << 5
+
+_RISK_BITS = {
+    _RISK_NEW_DOMAIN: '新規ドメイン（30日以内）',
+    _RISK_NO_SSL: 'SSL証明書なし',
+    _RISK_HIGH_ABUSE: '高い悪用リスク',
+    _RISK_COPYRIGHT: '著作権侵害の可能性',
+    _RISK_LOW_RANKING: '検索順位が低い',
+    _RISK_LOW_SIMILARITY: 'コンテンツ類似度が低い',
+}
+
+
+def _risk_factor_labels(flags: int) -> List[str]:
+    """リスク要因ビットをラベルのリストに変換"""
+    return [label for bit, label in _RISK_BITS.items() if flags & bit]
+
+
+@functools.lru_cache(maxsize=1024)
+def _mentions_high(value: Any) -> bool:
+    """AI分析の値が英語の 'high' を含むか（リスク要因の判定用）"""
+    return 'high' in str(value).lower()
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify_level(value: str, levels: Tuple[Tuple[str, ...], ...]) -> int:
+    """
+    AI分析の分類文字列を段階の添字に変換
+
+    上流の値は種類が少ないため、2回目以降は辞書引きだけで済む。
+    どの段階にも該当しない場合は len(levels) を返す。
+    """
+    value = value.lower()
+    for index, keywords in enumerate(levels):
+        if any(keyword in value for keyword in keywords):
+            return index
+    return len(levels)
+
+
+def _contains_any(text: str, automaton: Any, words: Tuple[str, ...]) -> bool:
+    """text がいずれかの語を含むか（オートマトンがあれば1パスで照合）"""
+    if automaton is not None:
+        return next(automaton.iter(text), None) is not None
+    return any(word in text for word in words)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso_utc(value: str) -> float:
+    """
+    ISO 8601文字列をエポック秒に変換（同じ日付文字列は一度だけ解析）
+
+    タイムゾーン表記は換算せず、壁時計時刻をUTCとして扱う。
+    """
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _to_epoch(date_value: Any) -> float:
+    """日付（ISO文字列またはdatetime）をエポック秒に変換"""
+    if isinstance(date_value, str):
+        return _parse_iso_utc(date_value)
+    return date_value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _round2(value: float) -> float:
+    """小数第2位への四捨五入（非負のスコア専用。round(x, 2) より軽量）"""
+    return int(value * 100 + 0.5) / 100.0
+
+
+# 直近に生成したISOタイムスタンプ（秒, 文字列）。タプルの差し替えで更新する
+_iso_cache: Tuple[int, str] = (-1, '')
+
+
+def _iso_now() -> str:
+    """現在時刻（UTC）のISO文字列。同じ秒の間は前回の文字列を再利用"""
+    global _iso_cache
+    second = int(time.time())
+    cached_second, cached_iso = _iso_cache
+    if cached_second != second:
+        cached_iso = datetime.utcfromtimestamp(second).isoformat()
+        _iso_cache = (second, cached_iso)
+    return cached_iso
+
+
+def _days_since(date_value: Any, now_epoch: float) -> int:
+    """日付からnow_epochまでの経過日数（timedelta.daysと同じく切り捨て）"""
+    return int((now_epoch - _to_epoch(date_value)) // 86400)
+
+
+def _compile_score_combiner(
+    top_weights: Tuple[float, ...],
+    domain_weights: Tuple[float, ...],
+    ai_weights: Tuple[float, ...],
+    other_weights: Tuple[float, ...]
+) -> Any:
+    """
+    重みを定数として埋め込んだ集計関数を生成
+
+    生成される関数は (domain_subs, ai_subs, other_subs) を受け取り、
+    カテゴリ別スコア（0-100にクランプ）と総合スコアを返す。
+    加算順序とクランプは従来の逐次計算と同一。
+    """
+    def weighted(name: str, weights: Tuple[float, ...]) -> str:
+        return ' + '.join(f'{name}[{i}] * {w!r}' for i, w in enumerate(weights))
+
+    w_domain, w_ai, w_other = top_weights
+    source = (
+        'def _combine_scores(d, a, o):\n'
+        f'    domain = min(100, max(0, {weighted("d", domain_weights)}))\n'
+        f'    ai = min(100, max(0, {weighted("a", ai_weights)}))\n'
+        f'    other = min(100, max(0, {weighted("o", other_weights)}))\n'
+        f'    return domain, ai, other, domain * {w_domain!r} + ai * {w_ai!r} + other * {w_other!r}\n'
+    )
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, '<threat_scorer combiner>', 'exec'), namespace)
+    return namespace['_combine_scores']
+
+
+def _weighted_column_sum(columns: List['np.ndarray'], weights: 'np.ndarray') -> 'np.ndarray':
+    """列ごとの重み付き和を c0*w0 + c1*w1 + ... の順で計算（_combine_scores と同じ加算順序）"""
+    total = columns[0] * weights[0]
+    for column, weight in zip(columns[1:], weights[1:]):
+        total = total + column * weight
+    return total
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _score_kernel(age_days, days_since_update, ranking, similarity, has_traffic, alexa_rank,
+                      has_social, total_shares, domain_static, ai_subs, w_top, w_domain, w_ai, w_other):
+        """
+        バッチスコア計算の数値部分（しきい値判定・重み付き集計・クランプ）を1ループで実行
+
+        domain_static はSSL/WHOIS/DNS/評判、ai_subs はAI分析4項目のサブスコア。
+        戻り値は各レコードの [domain, ai, other, total] スコア（domain_static と同じ精度）。
+        """
+        n = age_days.shape[0]
+        out = np.empty_like(domain_static)
+        for i in prange(n):
+            # ドメイン年齢（_score_domain_age と同一のしきい値）
+            age = age_days[i]
+            if np.isnan(age):
+                age_score = 50.0
+            elif age <= 30:
+                age_score = 90.0
+            elif age <= 180:
+                age_score = 80.0
+            elif age <= 365:
+                age_score = 60.0
+            elif age <= 365 * 2:
+                age_score = 40.0
+            elif age <= 365 * 5:
+                age_score = 20.0
+            else:
+                age_score = 10.0
+
+            # 検索順位
+            rank = ranking[i]
+            if rank <= 0:
+                ranking_score = 50.0
+            elif rank <= 3:
+                ranking_score = 10.0
+            elif rank <= 10:
+                ranking_score = 25.0
+            elif rank <= 20:
+                ranking_score = 40.0
+            elif rank <= 50:
+                ranking_score = 60.0
+            else:
+                ranking_score = 80.0
+
+            # コンテンツ類似度
+            sim = similarity[i]
+            if sim >= 0.9:
+                similarity_score = 20.0
+            elif sim >= 0.7:
+                similarity_score = 35.0
+            elif sim >= 0.5:
+                similarity_score = 50.0
+            elif sim >= 0.3:
+                similarity_score = 70.0
+            else:
+                similarity_score = 85.0
+
+            # 更新頻度
+            upd = days_since_update[i]
+            if np.isnan(upd):
+                update_score = 60.0
+            elif upd <= 7:
+                update_score = 30.0
+            elif upd <= 30:
+                update_score = 40.0
+            elif upd <= 90:
+                update_score = 55.0
+            elif upd <= 365:
+                update_score = 70.0
+            else:
+                update_score = 85.0
+
+            # トラフィック
+            alexa = alexa_rank[i]
+            if not has_traffic[i] or not alexa > 0:
+                traffic_score = 50.0
+            elif alexa <= 10000:
+                traffic_score = 10.0
+            elif alexa <= 100000:
+                traffic_score = 25.0
+            elif alexa <= 1000000:
+                traffic_score = 40.0
+            else:
+                traffic_score = 60.0
+
+            # ソーシャルシグナル
+            shares = total_shares[i]
+            if not has_social[i]:
+                social_score = 50.0
+            elif shares > 1000:
+                social_score = 20.0
+            elif shares > 100:
+                social_score = 35.0
+            elif shares > 10:
+                social_score = 50.0
+            else:
+                social_score = 70.0
+
+            # 重み付き集計（スカラー版と同じ加算順序、min(100, max(0, x)) と同じクランプ）
+            domain = (age_score * w_domain[0] + domain_static[i, 0] * w_domain[1] +
+                      domain_static[i, 1] * w_domain[2] + domain_static[i, 2] * w_domain[3] +
+                      domain_static[i, 3] * w_domain[4])
+            domain = domain if domain > 0.0 else 0.0
+            domain = domain if domain < 100.0 else 100.0
+
+            ai = (ai_subs[i, 0] * w_ai[0] + ai_subs[i, 1] * w_ai[1] +
+                  ai_subs[i, 2] * w_ai[2] + ai_subs[i, 3] * w_ai[3])
+            ai = ai if ai > 0.0 else 0.0
+            ai = ai if ai < 100.0 else 100.0
+
+            other = (ranking_score * w_other[0] + similarity_score * w_other[1] +
+                     update_score * w_other[2] + traffic_score * w_other[3] +
+                     social_score * w_other[4])
+            other = other if other > 0.0 else 0.0
+            other = other if other < 100.0 else 100.0
+
+            out[i, 0] = domain
+            out[i, 1] = ai
+            out[i, 2] = other
+            out[i, 3] = domain * w_top[0] + ai * w_top[1] + other * w_top[2]
+        return out
+
+    def _warm_up_score_kernel() -> bool:
+        """長さ2のダミー配列でJITコンパイルを済ませる（失敗時はFalse）"""
+        try:
+            zeros = np.zeros(2)
+            flags = np.zeros(2, dtype=np.bool_)
+            _score_kernel(
+                zeros, zeros, zeros, zeros, flags, zeros, flags, zeros,
+                np.zeros((2, 4)), np.zeros((2, 4)),
+                np.ones(3), np.ones(5), np.ones(4), np.ones(5)
+            )
+            return True
+        except Exception as e:
+            logger.warning("Numba score kernel compilation failed, using NumPy path: %s", e)
+            return False
+
+    NUMBA_AVAILABLE = _warm_up_score_kernel()
+
+
 class ThreatScorer:
     """脅威度スコアリングクラス"""
 
-    def __init__(self):
-        # 重み付け設定
-        self.weights = {
-            'domain_trust': 0.40,      # ドメイン信頼度: 40%
-            'ai_analysis': 0.40,       # AI分析結果: 40%
-            'other_factors': 0.20      # その他の要因: 20%
-        }
+    # 重み設定はクラス属性。インスタンスが持つのは永続キャッシュの接続のみ
+    __slots__ = ('cache_path', 'weights_version', '_score_db', '_score_db_lock')
+
+    # 重みを変更したら上げる（永続キャッシュの無効化に使用）
+    WEIGHTS_VERSION = 1
+
+    # スコア結果のLRUキャッシュ（プロセス内の全インスタンスで共有）
+    SCORE_CACHE_MAXSIZE = 8192
+    _score_cache: 'OrderedDict[bytes, bytes]' = OrderedDict()
+    _score_cache_lock = threading.Lock()
+    _score_cache_hits = 0
+    _score_cache_misses = 0
+
+    # LRUの前段に置くダイレクトマップ方式のL1キャッシュ（直後の再評価をロックなしで返す）
+    L1_CACHE_SLOTS = 128  # 2のべき乗
+    _l1_cache: List[Optional[Tuple[bytes, bytes]]] = [None] * L1_CACHE_SLOTS
+    _l1_cache_hits = 0
+
+    # 信頼度がこの値未満の入力はサブスコアを計算せずUNKNOWNを返す（strict=False時）
+    MIN_CONFIDENCE = 0.1
+    _calculation_count = 0
+    _short_circuit_count = 0
+
+    # 重み付け設定（全インスタンスで共有する読み取り専用マッピング）
+    _WEIGHTS = MappingProxyType({
+        'domain_trust': 0.40,      # ドメイン信頼度: 40%
+        'ai_analysis': 0.40,       # AI分析結果: 40%
+        'other_factors': 0.20      # その他の要因: 20%
+    })
+
+    # ドメイン信頼度の重み
+    _DOMAIN_WEIGHTS = MappingProxyType({
+        'domain_age': 0.30,        # ドメイン年齢
+        'ssl_certificate': 0.25,   # SSL証明書
+        'whois_info': 0.20,        # WHOIS情報
+        'dns_records': 0.15,       # DNS記録
+        'reputation': 0.10         # ドメイン評判
+    })
+
+    # AI分析の重み
+    _AI_WEIGHTS = MappingProxyType({
+        'abuse_detection': 0.35,   # 悪用検出
+        'copyright_risk': 0.30,    # 著作権リスク
+        'commercial_use': 0.20,    # 商用利用
+        'content_quality': 0.15    # コンテンツ品質
+    })
+
+    # その他要因の重み
+    _OTHER_WEIGHTS = MappingProxyType({
+        'search_ranking': 0.30,    # 検索順位
+        'content_similarity': 0.25, # コンテンツ類似度
+        'update_frequency': 0.20,  # 更新頻度
+        'traffic_data': 0.15,      # トラフィックデータ
+        'social_signals': 0.10     # ソーシャルシグナル
+    })
+
+    # 設定取得API向けの公開名
+    weights = _WEIGHTS
+    domain_weights = _DOMAIN_WEIGHTS
+    ai_weights = _AI_WEIGHTS
+    other_weights = _OTHER_WEIGHTS
+
+    # 計算用の重み（マッピングの定義順）。マッピングは結果・設定の出力用
+    _top_w = tuple(_WEIGHTS.values())
+    _domain_w = tuple(_DOMAIN_WEIGHTS.values())
+    _ai_w = tuple(_AI_WEIGHTS.values())
+    _other_w = tuple(_OTHER_WEIGHTS.values())
+
+    # 1件ずつの計算用に重みを埋め込んだ集計関数
+    _combine_scores = staticmethod(_compile_score_combiner(_top_w, _domain_w, _ai_w, _other_w))
+
+    # バッチ計算用の重みベクトル
+    if NUMPY_AVAILABLE:
+        _top_w_vec = np.array(_top_w)
+        _domain_w_vec = np.array(_domain_w)
+        _ai_w_vec = np.array(_ai_w)
+        _other_w_vec = np.array(_other_w)
+
+    def __init__(self, cache_path: Optional[str] = None, weights_version: int = WEIGHTS_VERSION):
+        """
+        Args:
+            cache_path: スコア結果を永続化するSQLiteファイルのパス（Noneで無効）
+            weights_version: 永続キャッシュのバージョン（一致する行のみ使用）
+        """
+        self.cache_path = cache_path
+        self.weights_version = weights_version
+        self._score_db: Optional[sqlite3.Connection] = None
+        self._score_db_lock = threading.Lock()
 
-        # ドメイン信頼度の重み
-        self.domain_weights = {
-            'domain_age': 0.30,        # ドメイン年齢
-            'ssl_certificate': 0.25,   # SSL証明書
-            'whois_info': 0.20,        # WHOIS情報
-            'dns_records': 0.15,       # DNS記録
-            'reputation': 0.10         # ドメイン評判
-        }
+        if cache_path:
+            try:
+                self._score_db = self._open_score_db(cache_path)
+            except Exception as e:
+                logger.warning("Score cache database unavailable (%s): %s", cache_path, e)
+
+    @staticmethod
+    def _open_score_db(cache_path: str) -> sqlite3.Connection:
+        """永続スコアキャッシュのSQLiteを開いてテーブルを用意"""
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(cache_path, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS scores('
+            'key BLOB PRIMARY KEY, version INTEGER NOT NULL, result BLOB NOT NULL, created_at INTEGER NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS scores_created_at ON scores(created_at)')
+        return conn
 
-        # AI分析の重み
-        self.ai_weights = {
-            'abuse_detection': 0.35,   # 悪用検出
-            'copyright_risk': 0.30,    # 著作権リスク
-            'commercial_use': 0.20,    # 商用利用
-            'content_quality': 0.15    # コンテンツ品質
-        }
+    def _db_get(self, key: bytes) -> Optional[bytes]:
+        """永続キャッシュから結果を取得（バージョン不一致は無視）"""
+        try:
+            with self._score_db_lock:
+                row = self._score_db.execute(
+                    'SELECT result FROM scores WHERE key = ? AND version = ?',
+                    (key, self.weights_version)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Score cache read failed: %s", e)
+            return None
+        return row[0] if row else None
+
+    def _db_put(self, key: bytes, data: bytes) -> None:
+        """永続キャッシュに結果を保存"""
+        try:
+            with self._score_db_lock:
+                self._score_db.execute(
+                    'INSERT OR REPLACE INTO scores(key, version, result, created_at) VALUES (?, ?, ?, ?)',
+                    (key, self.weights_version, data, int(time.time()))
+                )
+        except sqlite3.Error as e:
+            logger.warning("Score cache write failed: %s", e)
+
+    def clear_score_cache(self, older_than: Optional[timedelta] = timedelta(weeks=1)) -> int:
+        """
+        永続スコアキャッシュを削除
 
-        # その他要因の重み
-        self.other_weights = {
-            'search_ranking': 0.30,    # 検索順位
-            'content_similarity': 0.25, # コンテンツ類似度
-            'update_frequency': 0.20,  # 更新頻度
-            'traffic_data': 0.15,      # トラフィックデータ
-            'social_signals': 0.10     # ソーシャルシグナル
-        }
+        Args:
+            older_than: この期間より古い行のみ削除（Noneで全削除）
+
+        Returns:
+            int: 削除した行数
+        """
+        if self._score_db is None:
+            return 0
+
+        with self._score_db_lock:
+            if older_than is None:
+                cursor = self._score_db.execute('DELETE FROM scores')
+            else:
+                cutoff = int(time.time() - older_than.total_seconds())
+                cursor = self._score_db.execute('DELETE FROM scores WHERE created_at < ?', (cutoff,))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """永続スコアキャッシュの接続を閉じる"""
+        if self._score_db is not None:
+            with self._score_db_lock:
+                self._score_db.close()
+            self._score_db = None
 
     def calculate_score(
         self,
         domain_data: Dict[str, Any],
         ai_analysis: Dict[str, Any],
         search_data: Dict[str, Any],
-        content_data: Dict[str, Any]
+        content_data: Dict[str, Any],
+        cache: bool = False,
+        strict: bool = False
     ) -> Dict[str, Any]:
         """
         総合脅威度スコアを計算
@@ -64,195 +604,541 @@ class ThreatScorer:
             ai_analysis: AI分析結果
             search_data: 検索関連データ
             content_data: コンテンツデータ
+            cache: 同一入力の結果をキャッシュから返すか（デフォルト: False）
+            strict: 信頼度が低くても内訳を含めて計算するか（デフォルト: False）
 
         Returns:
             Dict: 脅威度評価結果
         """
+        if cache:
+            return self._calculate_score_cached(domain_data, ai_analysis, search_data, content_data, strict)
+
+        return self._score_record(domain_data, ai_analysis, search_data, content_data, strict, verbose=True)
+
+    def _score_record(
+        self,
+        domain_data: Dict[str, Any],
+        ai_analysis: Dict[str, Any],
+        search_data: Dict[str, Any],
+        content_data: Dict[str, Any],
+        strict: bool = False,
+        verbose: bool = False
+    ) -> Dict[str, Any]:
+        """1件分のスコア計算本体（verbose=False ではレコード単位のINFOログを出さない）"""
         try:
-            # 各カテゴリのスコア計算
-            domain_score = self._calculate_domain_score(domain_data)
-            ai_score = self._calculate_ai_score(ai_analysis)
-            other_score = self._calculate_other_score(search_data, content_data)
-
-            # 重み付き総合スコア
-            total_score = (
-                domain_score * self.weights['domain_trust'] +
-                ai_score * self.weights['ai_analysis'] +
-                other_score * self.weights['other_factors']
+            # 信頼度が極端に低い入力はサブスコア計算を省略
+            confidence = self._calculate_confidence(domain_data, ai_analysis)
+            if not strict and self._should_short_circuit(confidence):
+                if verbose and logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Threat score short-circuited (confidence=%.3f): %d/%d calculations",
+                        confidence, self._short_circuit_count, self._calculation_count
+                    )
+                return self._create_low_confidence_result(confidence)
+
+            # 現在時刻は1回だけ取得して全サブスコアで共有
+            now_epoch = time.time()
+
+            # 各カテゴリのサブスコア計算（リスク要因ビットも同時に収集）
+            domain_subs, domain_flags = self._domain_subscores(domain_data, now_epoch)
+            ai_subs, ai_flags = self._ai_subscores(ai_analysis)
+            other_subs, other_flags = self._other_subscores(search_data, content_data, now_epoch)
+
+            # カテゴリ別スコアと重み付き総合スコア
+            domain_score, ai_score, other_score, total_score = self._combine_scores(
+                domain_subs, ai_subs, other_subs
             )
 
-            # スコア正規化（0-100）
-            normalized_score = max(0, min(100, total_score))
-
-            # 脅威レベル決定
-            threat_level = self._determine_threat_level(normalized_score)
-
-            # 詳細結果
-            result = {
-                'overall_score': round(normalized_score, 2),
-                'threat_level': threat_level,
-                'confidence': self._calculate_confidence(domain_data, ai_analysis),
-                'components': {
-                    'domain_trust': {
-                        'score': round(domain_score, 2),
-                        'weight': self.weights['domain_trust'],
-                        'contribution': round(domain_score * self.weights['domain_trust'], 2)
-                    },
-                    'ai_analysis': {
-                        'score': round(ai_score, 2),
-                        'weight': self.weights['ai_analysis'],
-                        'contribution': round(ai_score * self.weights['ai_analysis'], 2)
-                    },
-                    'other_factors': {
-                        'score': round(other_score, 2),
-                        'weight': self.weights['other_factors'],
-                        'contribution': round(other_score * self.weights['other_factors'], 2)
-                    }
-                },
-                'risk_factors': self._identify_risk_factors(
-                    domain_data, ai_analysis, search_data, content_data
-                ),
-                'recommendations': self._generate_recommendations(normalized_score, threat_level),
-                'calculated_at': datetime.utcnow().isoformat()
-            }
+            result = self._build_result(
+                domain_score, ai_score, other_score, total_score,
+                confidence,
+                _risk_factor_labels(domain_flags | ai_flags | other_flags),
+                _iso_now()
+            )
 
-            logger.info(f"Threat score calculated: {normalized_score} ({threat_level})")
+            if verbose and logger.isEnabledFor(logging.INFO):
+                logger.info("Threat score calculated: %s (%s)", result['overall_score'], result['threat_level'])
             return result
 
         except Exception as e:
-            logger.error(f"Threat score calculation failed: {e}")
+            logger.error("Threat score calculation failed: %s", e)
             return self._create_error_result(str(e))
 
-    def _calculate_domain_score(self, domain_data: Dict[str, Any]) -> float:
-        """ドメイン信頼度スコアを計算"""
-        score = 0.0
+    def _calculate_score_cached(
+        self,
+        domain_data: Dict[str, Any],
+        ai_analysis: Dict[str, Any],
+        search_data: Dict[str, Any],
+        content_data: Dict[str, Any],
+        strict: bool = False
+    ) -> Dict[str, Any]:
+        """入力のダイジェストをキーにL1・LRU・永続キャッシュの順に引いてスコアを返す"""
+        try:
+            # 経過日数ベースのスコアがあるため日付もキーに含める
+            key = hashlib.blake2b(
+                _dumps((domain_data, ai_analysis, search_data, content_data, int(time.time()) // 86400, strict)),
+                digest_size=16
+            ).digest()
+        except Exception as e:
+            logger.debug("Score cache key generation failed: %s", e)
+            return self.calculate_score(domain_data, ai_analysis, search_data, content_data, strict=strict)
+
+        cls = type(self)
+
+        # L1: スロットの読み書きは単一の代入なのでロック不要
+        slot = hash(key) & (cls.L1_CACHE_SLOTS - 1)
+        entry = cls._l1_cache[slot]
+        if entry is not None and entry[0] == key:
+            cls._l1_cache_hits += 1
+            cached = entry[1]
+        else:
+            with cls._score_cache_lock:
+                cached = cls._score_cache.get(key)
+                if cached is not None:
+                    cls._score_cache.move_to_end(key)
+                    cls._score_cache_hits += 1
+                else:
+                    cls._score_cache_misses += 1
+            if cached is None and self._score_db is not None:
+                cached = self._db_get(key)
+                if cached is not None:
+                    with cls._score_cache_lock:
+                        cls._score_cache[key] = cached
+                        if len(cls._score_cache) > cls.SCORE_CACHE_MAXSIZE:
+                            cls._score_cache.popitem(last=False)
+            if cached is not None:
+                cls._l1_cache[slot] = (key, cached)
+
+        if cached is not None:
+            result = _loads(cached)
+            result['calculated_at'] = _iso_now()
+            return result
 
+        result = self.calculate_score(domain_data, ai_analysis, search_data, content_data, strict=strict)
+        if 'error' not in result:
+            data = _dumps(result)
+            with cls._score_cache_lock:
+                cls._score_cache[key] = data
+                if len(cls._score_cache) > cls.SCORE_CACHE_MAXSIZE:
+                    cls._score_cache.popitem(last=False)
+            cls._l1_cache[slot] = (key, data)
+            if self._score_db is not None:
+                self._db_put(key, data)
+        return result
+
+    @classmethod
+    def score_cache_info(cls) -> Dict[str, int]:
+        """スコアキャッシュの統計情報（maxsize調整用）"""
+        with cls._score_cache_lock:
+            return {
+                'l1_hits': cls._l1_cache_hits,
+                'hits': cls._score_cache_hits,
+                'misses': cls._score_cache_misses,
+                'maxsize': cls.SCORE_CACHE_MAXSIZE,
+                'currsize': len(cls._score_cache),
+            }
+
+    @classmethod
+    def _should_short_circuit(cls, confidence: float) -> bool:
+        """信頼度が下限未満か判定し、省略率の集計を更新"""
+        cls._calculation_count += 1
+        if confidence >= cls.MIN_CONFIDENCE:
+            return False
+
+        cls._short_circuit_count += 1
+        return True
+
+    def calculate_scores_batch(
+        self,
+        records: List[Dict[str, Any]],
+        strict: bool = False,
+        precision: str = 'fp64'
+    ) -> List[Dict[str, Any]]:
+        """
+        複数レコードの脅威度スコアをまとめて計算
+
+        数値しきい値によるサブスコアと重み付き集計をNumPyでベクトル化する。
+        NumPyが利用できない場合は1件ずつ計算する。
+
+        Args:
+            records: domain_data / ai_analysis / search_data / content_data を
+                キーに持つ辞書のリスト
+            strict: 信頼度が低くても内訳を含めて計算するか（デフォルト: False）
+            precision: 集計の浮動小数点精度 'fp64' または 'fp32'（デフォルト: 'fp64'）
+                'fp64' はcalculate_scoreと同じ加算順序で集計するため結果が完全に一致する。
+                'fp32' はサブスコア行列と重みを単精度で扱い、大量バッチのメモリ転送量を半減する。
+                丸め結果がcalculate_scoreと0.01ずれる場合がある。
+
+        Returns:
+            List[Dict]: recordsと同じ順序の脅威度評価結果
+        """
+        if precision not in _BATCH_DTYPES:
+            raise ValueError(f"Unsupported precision: {precision}")
+
+        if not records:
+            return []
+
+        results = None
+        if NUMPY_AVAILABLE:
+            try:
+                results = self._calculate_scores_vectorized(records, strict, precision)
+            except Exception as e:
+                logger.error("Batch threat score calculation failed, falling back: %s", e)
+
+        if results is None:
+            results = [self._calculate_record(record, strict) for record in records]
+
+        # レコード単位ではなくバッチ全体で1行だけ出力
+        if logger.isEnabledFor(logging.INFO):
+            unknown = sum(1 for result in results if result['threat_level'] == 'UNKNOWN')
+            logger.info("Threat scores calculated for %d records (%d unknown)", len(results), unknown)
+        return results
+
+    def _calculate_record(self, record: Dict[str, Any], strict: bool = False) -> Dict[str, Any]:
+        """バッチ用レコード1件を評価（レコード単位のINFOログなし）"""
+        return self._score_record(
+            record.get('domain_data', {}),
+            record.get('ai_analysis', {}),
+            record.get('search_data', {}),
+            record.get('content_data', {}),
+            strict
+        )
+
+    def _calculate_scores_vectorized(
+        self,
+        records: List[Dict[str, Any]],
+        strict: bool = False,
+        precision: str = 'fp64'
+    ) -> List[Dict[str, Any]]:
+        """NumPyによるバッチスコア計算本体"""
+        dtype = np.dtype(_BATCH_DTYPES[precision])
+        now_epoch = time.time()
+        calculated_at = _iso_now()
+
+        domain_list = [r.get('domain_data', {}) for r in records]
+        ai_list = [r.get('ai_analysis', {}) for r in records]
+        search_list = [r.get('search_data', {}) for r in records]
+        content_list = [r.get('content_data', {}) for r in records]
+
+        # 数値特徴量を配列化（欠損・解析不能はNaN）
+        age_days = np.array([
+            self._days_between(d.get('creation_date'), now_epoch) for d in domain_list
+        ], dtype=float)
+        days_since_update = np.array([
+            self._days_between(c.get('last_updated'), now_epoch) for c in content_list
+        ], dtype=float)
+        ranking = np.array([float(s.get('ranking', 0)) for s in search_list])
+        similarity = np.array([float(c.get('similarity_score', 0)) for c in content_list])
+        has_traffic = np.array([bool(s.get('traffic_estimate')) for s in search_list])
+        alexa_rank = np.array([
+            float((s.get('traffic_estimate') or {}).get('alexa_rank', 0)) for s in search_list
+        ])
+        has_social = np.array([bool(c.get('social_data')) for c in content_list])
+        total_shares = np.array([
+            self._total_shares(c.get('social_data') or {}) for c in content_list
+        ], dtype=float)
+
+        # 文字列・辞書ベースのサブスコアはレコードごとに算出
+        ssl_results = [self._score_ssl_certificate(d.get('ssl_info', {})) for d in domain_list]
+        abuse_results = [self._score_abuse_detection(a.get('abuse_detection', {})) for a in ai_list]
+        copyright_results = [
+            self._score_copyright_risk(a.get('copyright_infringement', {})) for a in ai_list
+        ]
+        domain_static = np.array([[
+            ssl_score,
+            self._score_whois_info(d.get('whois_info', {}), now_epoch),
+            self._score_dns_records(d.get('dns_records', {})),
+            self._score_domain_reputation(d.get('reputation', {})),
+        ] for (ssl_score, _), d in zip(ssl_results, domain_list)], dtype=dtype).reshape(len(records), 4)
+        ai_subs = np.array([[
+            abuse_score,
+            copyright_score,
+            self._score_commercial_use(a.get('commercial_use', {})),
+            self._score_content_quality(a.get('content_modification', {})),
+        ] for (abuse_score, _), (copyright_score, _), a in zip(
+            abuse_results, copyright_results, ai_list
+        )], dtype=dtype).reshape(len(records), 4)
+
+        # リスク要因ビット（数値条件は配列で判定）
+        risk_flags = (
+            np.where(age_days < 30, _RISK_NEW_DOMAIN, 0) |
+            np.where(ranking > 50, _RISK_LOW_RANKING, 0)
+        ).tolist()
+
+        # しきい値判定用の特徴量は倍精度のまま、集計（サブスコア行列と重み）を指定精度で行う
+        weight_vecs = tuple(
+            w.astype(dtype, copy=False)
+            for w in (self._top_w_vec, self._domain_w_vec, self._ai_w_vec, self._other_w_vec)
+        )
+        if NUMBA_AVAILABLE:
+            scores = _score_kernel(
+                age_days, days_since_update, ranking, similarity, has_traffic, alexa_rank,
+                has_social, total_shares, domain_static, ai_subs, *weight_vecs
+            )
+            domain_scores, ai_scores, other_scores, totals = scores.T
+        else:
+            domain_scores, ai_scores, other_scores, totals = self._aggregate_numpy(
+                age_days, days_since_update, ranking, similarity, has_traffic, alexa_rank,
+                has_social, total_shares, domain_static, ai_subs, weight_vecs
+            )
+
+        results = []
+        for i, (domain_score, ai_score, other_score, total_score) in enumerate(zip(
+            domain_scores.tolist(), ai_scores.tolist(), other_scores.tolist(), totals.tolist()
+        )):
+            confidence = self._calculate_confidence(domain_list[i], ai_list[i])
+            if not strict and self._should_short_circuit(confidence):
+                results.append(self._create_low_confidence_result(confidence))
+                continue
+
+            results.append(self._build_result(
+                domain_score, ai_score, other_score, total_score,
+                confidence,
+                _risk_factor_labels(
+                    risk_flags[i] | ssl_results[i][1] | abuse_results[i][1] |
+                    copyright_results[i][1] | self._similarity_risk(content_list[i])
+                ),
+                calculated_at
+            ))
+
+        return results
+
+    def _aggregate_numpy(
+        self,
+        age_days: 'np.ndarray',
+        days_since_update: 'np.ndarray',
+        ranking: 'np.ndarray',
+        similarity: 'np.ndarray',
+        has_traffic: 'np.ndarray',
+        alexa_rank: 'np.ndarray',
+        has_social: 'np.ndarray',
+        total_shares: 'np.ndarray',
+        domain_static: 'np.ndarray',
+        ai_subs: 'np.ndarray',
+        weight_vecs: Tuple['np.ndarray', 'np.ndarray', 'np.ndarray', 'np.ndarray']
+    ) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """Numbaが利用できない場合のNumPyによる集計（精度は domain_static の dtype に従う）"""
+        dtype = domain_static.dtype
+        w_top, w_domain, w_ai, w_other = weight_vecs
+        # 区分線形のサブスコア（各 _score_* のしきい値と同一）
+        age_score = np.where(np.isnan(age_days), 50.0, np.take(
+            _AGE_SCORES, np.searchsorted(_AGE_THRESHOLDS, age_days, side='left')
+        ))
+        ranking_score = np.where(ranking <= 0, 50.0, np.take(
+            _RANKING_SCORES, np.searchsorted(_RANKING_THRESHOLDS, ranking, side='left')
+        ))
+        similarity_score = np.take(
+            _SIMILARITY_SCORES, np.searchsorted(_SIMILARITY_THRESHOLDS, similarity, side='right')
+        )
+        update_score = np.where(np.isnan(days_since_update), 60.0, np.take(
+            _UPDATE_SCORES, np.searchsorted(_UPDATE_THRESHOLDS, days_since_update, side='left')
+        ))
+        traffic_score = np.where(~has_traffic | (alexa_rank <= 0), 50.0, np.take(
+            _TRAFFIC_SCORES, np.searchsorted(_TRAFFIC_THRESHOLDS, alexa_rank, side='left')
+        ))
+        social_score = np.where(~has_social, 50.0, np.take(
+            _SHARE_SCORES, np.searchsorted(_SHARE_THRESHOLDS, total_shares, side='left')
+        ))
+
+        domain_subs = [age_score.astype(dtype, copy=False)] + list(domain_static.T)
+        ai_cols = list(ai_subs.T)
+        other_subs = [
+            score.astype(dtype, copy=False)
+            for score in (ranking_score, similarity_score, update_score, traffic_score, social_score)
+        ]
+
+        # 重み付き集計（行列積は加算順序が異なり丸め結果がずれるため、スカラー版と同じ左から順の列加算）
+        domain_scores = np.clip(_weighted_column_sum(domain_subs, w_domain), 0, 100)
+        ai_scores = np.clip(_weighted_column_sum(ai_cols, w_ai), 0, 100)
+        other_scores = np.clip(_weighted_column_sum(other_subs, w_other), 0, 100)
+        totals = _weighted_column_sum([domain_scores, ai_scores, other_scores], w_top)
+
+        return domain_scores, ai_scores, other_scores, totals
+
+    def _build_result(
+        self,
+        domain_score: float,
+        ai_score: float,
+        other_score: float,
+        total_score: float,
+        confidence: float,
+        risk_factors: List[str],
+        calculated_at: str
+    ) -> Dict[str, Any]:
+        """カテゴリ別スコアから評価結果の辞書を組み立てる"""
+        # スコア正規化（0-100）
+        normalized_score = max(0, min(100, total_score))
+
+        # 脅威レベル決定
+        threat_level = self._determine_threat_level(normalized_score)
+
+        # 詳細結果
+        return {
+            'overall_score': _round2(normalized_score),
+            'threat_level': threat_level,
+            'confidence': confidence,
+            'components': {
+                'domain_trust': {
+                    'score': _round2(domain_score),
+                    'weight': self._WEIGHTS['domain_trust'],
+                    'contribution': _round2(domain_score * self._WEIGHTS['domain_trust'])
+                },
+                'ai_analysis': {
+                    'score': _round2(ai_score),
+                    'weight': self._WEIGHTS['ai_analysis'],
+                    'contribution': _round2(ai_score * self._WEIGHTS['ai_analysis'])
+                },
+                'other_factors': {
+                    'score': _round2(other_score),
+                    'weight': self._WEIGHTS['other_factors'],
+                    'contribution': _round2(other_score * self._WEIGHTS['other_factors'])
+                }
+            },
+            'risk_factors': risk_factors,
+            'recommendations': self._generate_recommendations(normalized_score, threat_level),
+            'calculated_at': calculated_at
+        }
+
+    @staticmethod
+    def _days_between(date_value: Any, now_epoch: float) -> float:
+        """日付（ISO文字列またはdatetime）からnow_epochまでの経過日数（不明な場合はNaN）"""
+        if not date_value:
+            return math.nan
+        try:
+            return _days_since(date_value, now_epoch)
+        except Exception:
+            return math.nan
+
+    @staticmethod
+    def _similarity_risk(content_data: Dict[str, Any]) -> int:
+        """類似度が低い場合のリスクビット（未指定は類似度1.0として扱う）"""
+        return _RISK_LOW_SIMILARITY if content_data.get('similarity_score', 1.0) < 0.3 else 0
+
+    @staticmethod
+    def _total_shares(social_data: Dict[str, Any]) -> float:
+        """SNSでのシェア数合計"""
+        return sum(social_data.get(key, 0) for key in _SOCIAL_KEYS)
+
+    def _domain_subscores(
+        self,
+        domain_data: Dict[str, Any],
+        now_epoch: float
+    ) -> Tuple[Tuple[float, ...], int]:
+        """ドメイン信頼度のサブスコア（_DOMAIN_WEIGHTS順）とリスク要因ビットを計算"""
         # ドメイン年齢評価
-        domain_age_score = self._score_domain_age(
+        domain_age_score, age_flags = self._score_domain_age(
             domain_data.get('creation_date'),
-            domain_data.get('expiration_date')
+            domain_data.get('expiration_date'),
+            now_epoch
         )
-        score += domain_age_score * self.domain_weights['domain_age']
 
         # SSL証明書評価
-        ssl_score = self._score_ssl_certificate(domain_data.get('ssl_info', {}))
-        score += ssl_score * self.domain_weights['ssl_certificate']
+        ssl_score, ssl_flags = self._score_ssl_certificate(domain_data.get('ssl_info', {}))
 
         # WHOIS情報評価
-        whois_score = self._score_whois_info(domain_data.get('whois_info', {}))
-        score += whois_score * self.domain_weights['whois_info']
+        whois_score = self._score_whois_info(domain_data.get('whois_info', {}), now_epoch)
 
         # DNS記録評価
         dns_score = self._score_dns_records(domain_data.get('dns_records', {}))
-        score += dns_score * self.domain_weights['dns_records']
 
         # ドメイン評判評価
         reputation_score = self._score_domain_reputation(domain_data.get('reputation', {}))
-        score += reputation_score * self.domain_weights['reputation']
-
-        return min(100, max(0, score))
 
-    def _calculate_ai_score(self, ai_analysis: Dict[str, Any]) -> float:
-        """AI分析スコアを計算"""
-        score = 0.0
+        return (
+            (domain_age_score, ssl_score, whois_score, dns_score, reputation_score),
+            age_flags | ssl_flags
+        )
 
+    def _ai_subscores(self, ai_analysis: Dict[str, Any]) -> Tuple[Tuple[float, ...], int]:
+        """AI分析のサブスコア（_AI_WEIGHTS順）とリスク要因ビットを計算"""
         # 悪用検出評価
-        abuse_score = self._score_abuse_detection(ai_analysis.get('abuse_detection', {}))
-        score += abuse_score * self.ai_weights['abuse_detection']
+        abuse_score, abuse_flags = self._score_abuse_detection(ai_analysis.get('abuse_detection', {}))
 
         # 著作権リスク評価
-        copyright_score = self._score_copyright_risk(ai_analysis.get('copyright_infringement', {}))
-        score += copyright_score * self.ai_weights['copyright_risk']
+        copyright_score, copyright_flags = self._score_copyright_risk(
+            ai_analysis.get('copyright_infringement', {})
+        )
 
         # 商用利用評価
         commercial_score = self._score_commercial_use(ai_analysis.get('commercial_use', {}))
-        score += commercial_score * self.ai_weights['commercial_use']
 
         # コンテンツ品質評価
         quality_score = self._score_content_quality(ai_analysis.get('content_modification', {}))
-        score += quality_score * self.ai_weights['content_quality']
 
-        return min(100, max(0, score))
-
-    def _calculate_other_score(self, search_data: Dict[str, Any], content_data: Dict[str, Any]) -> float:
-        """その他要因スコアを計算"""
-        score = 0.0
+        return (
+            (abuse_score, copyright_score, commercial_score, quality_score),
+            abuse_flags | copyright_flags
+        )
 
+    def _other_subscores(
+        self,
+        search_data: Dict[str, Any],
+        content_data: Dict[str, Any],
+        now_epoch: float
+    ) -> Tuple[Tuple[float, ...], int]:
+        """その他要因のサブスコア（_OTHER_WEIGHTS順）とリスク要因ビットを計算"""
         # 検索順位評価
-        ranking_score = self._score_search_ranking(search_data.get('ranking', 0))
-        score += ranking_score * self.other_weights['search_ranking']
+        ranking_score, ranking_flags = self._score_search_ranking(search_data.get('ranking', 0))
 
         # コンテンツ類似度評価
         similarity_score = self._score_content_similarity(content_data.get('similarity_score', 0))
-        score += similarity_score * self.other_weights['content_similarity']
 
         # 更新頻度評価
-        update_score = self._score_update_frequency(content_data.get('last_updated'))
-        score += update_score * self.other_weights['update_frequency']
+        update_score = self._score_update_frequency(content_data.get('last_updated'), now_epoch)
 
         # トラフィックデータ評価
         traffic_score = self._score_traffic_data(search_data.get('traffic_estimate', {}))
-        score += traffic_score * self.other_weights['traffic_data']
 
         # ソーシャルシグナル評価
         social_score = self._score_social_signals(content_data.get('social_data', {}))
-        score += social_score * self.other_weights['social_signals']
 
-        return min(100, max(0, score))
+        return (
+            (ranking_score, similarity_score, update_score, traffic_score, social_score),
+            ranking_flags | self._similarity_risk(content_data)
+        )
 
-    def _score_domain_age(self, creation_date: Optional[str], expiration_date: Optional[str]) -> float:
-        """ドメイン年齢スコア（古いほど信頼度高）"""
+    def _score_domain_age(
+        self,
+        creation_date: Optional[str],
+        expiration_date: Optional[str],
+        now_epoch: float
+    ) -> Tuple[float, int]:
+        """ドメイン年齢スコア（古いほど信頼度高）と新規ドメインのリスクビット"""
         if not creation_date:
-            return 50.0  # 不明な場合は中間値
+            return 50.0, 0  # 不明な場合は中間値
 
         try:
-            if isinstance(creation_date, str):
-                creation = datetime.fromisoformat(creation_date.replace('Z', '+00:00'))
-            else:
-                creation = creation_date
-
-            age_days = (datetime.utcnow() - creation.replace(tzinfo=None)).days
-
-            # 年齢による信頼度スコア
-            if age_days > 365 * 5:  # 5年以上
-                return 10.0  # 低リスク
-            elif age_days > 365 * 2:  # 2年以上
-                return 20.0
-            elif age_days > 365:  # 1年以上
-                return 40.0
-            elif age_days > 180:  # 6ヶ月以上
-                return 60.0
-            elif age_days > 30:  # 1ヶ月以上
-                return 80.0
-            else:  # 新しいドメイン
-                return 90.0  # 高リスク
+            age_days = _days_since(creation_date, now_epoch)
+
+            # 年齢による信頼度スコア（5年超: 10.0 〜 30日以内: 90.0）
+            score = _AGE_SCORES[bisect.bisect_left(_AGE_THRESHOLDS, age_days)]
+            return score, _RISK_NEW_DOMAIN if age_days < 30 else 0
 
         except Exception:
-            return 50.0
+            return 50.0, 0
 
-    def _score_ssl_certificate(self, ssl_info: Dict[str, Any]) -> float:
-        """SSL証明書スコア"""
+    def _score_ssl_certificate(self, ssl_info: Dict[str, Any]) -> Tuple[float, int]:
+        """SSL証明書スコアとSSLなしのリスクビット"""
         if not ssl_info:
-            return 70.0  # SSL情報なしは中リスク
+            return 70.0, _RISK_NO_SSL  # SSL情報なしは中リスク
 
         has_ssl = ssl_info.get('has_ssl', False)
         is_valid = ssl_info.get('is_valid', False)
         issuer = ssl_info.get('issuer', '').lower()
 
         if not has_ssl:
-            return 80.0  # SSL なしは高リスク
+            return 80.0, _RISK_NO_SSL  # SSL なしは高リスク
 
         if not is_valid:
-            return 75.0  # 無効なSSLは高リスク
+            return 75.0, 0  # 無効なSSLは高リスク
 
         # 証明書発行者による評価
-        trusted_issuers = ['let\'s encrypt', 'digicert', 'symantec', 'comodo', 'godaddy']
-        if any(trusted in issuer for trusted in trusted_issuers):
-            return 10.0  # 信頼できる発行者
+        if _contains_any(issuer, _ISSUER_AC, _TRUSTED_ISSUERS):
+            return 10.0, 0  # 信頼できる発行者
         else:
-            return 30.0  # その他の発行者
+            return 30.0, 0  # その他の発行者
 
-    def _score_whois_info(self, whois_info: Dict[str, Any]) -> float:
+    def _score_whois_info(self, whois_info: Dict[str, Any], now_epoch: float) -> float:
         """WHOIS情報スコア"""
         if not whois_info:
             return 60.0
@@ -274,12 +1160,7 @@ class ThreatScorer:
         expiry = whois_info.get('expiration_date')
         if expiry:
             try:
-                if isinstance(expiry, str):
-                    exp_date = datetime.fromisoformat(expiry.replace('Z', '+00:00'))
-                else:
-                    exp_date = expiry
-
-                days_to_expiry = (exp_date.replace(tzinfo=None) - datetime.utcnow()).days
+                days_to_expiry = int((_to_epoch(expiry) - now_epoch) // 86400)
                 if days_to_expiry > 365:
                     score -= 10.0  # 長期登録は信頼度up
                 elif days_to_expiry < 30:
@@ -302,16 +1183,16 @@ class ThreatScorer:
             score -= 10.0
 
         # SPF/DKIM/DMARC（メール認証）
-        txt_records = dns_records.get('txt_records', [])
-        if any('spf' in record.lower() for record in txt_records):
+        # レコードごとに lower() せず、連結して一度だけ小文字化する
+        joined_txt = '\n'.join(dns_records.get('txt_records', [])).lower()
+        if 'spf' in joined_txt:
             score -= 5.0
-        if any('dkim' in record.lower() for record in txt_records):
+        if 'dkim' in joined_txt:
             score -= 5.0
 
         # CDNやセキュリティサービス
-        cname_records = dns_records.get('cname_records', [])
-        security_providers = ['cloudflare', 'akamai', 'fastly', 'amazon']
-        if any(provider in str(cname_records).lower() for provider in security_providers):
+        joined_cname = str(dns_records.get('cname_records', [])).lower()
+        if _contains_any(joined_cname, _SECURITY_PROVIDER_AC, _SECURITY_PROVIDERS):
             score -= 15.0
 
         return max(0, min(100, score))
@@ -333,124 +1214,77 @@ class ThreatScorer:
 
         return 50.0
 
-    def _score_abuse_detection(self, abuse_data: Dict[str, Any]) -> float:
-        """悪用検出スコア"""
+    def _score_abuse_detection(self, abuse_data: Dict[str, Any]) -> Tuple[float, int]:
+        """悪用検出スコアと高悪用リスクのビット"""
         if not abuse_data:
-            return 50.0
+            return 50.0, 0
 
-        risk_level = abuse_data.get('risk_level', '').lower()
+        risk_level = abuse_data.get('risk_level', '')
         confidence = abuse_data.get('confidence', 0.5)
 
         # リスクレベルベースのスコア
-        if '高' in risk_level or 'high' in risk_level:
-            base_score = 90.0
-        elif '中' in risk_level or 'medium' in risk_level:
-            base_score = 60.0
-        else:
-            base_score = 20.0
+        base_score = _ABUSE_SCORES[_classify_level(risk_level, _RISK_LEVELS)]
 
         # 信頼度による調整
         adjusted_score = base_score * confidence + 50.0 * (1 - confidence)
 
-        return min(100, max(0, adjusted_score))
+        flags = _RISK_HIGH_ABUSE if _mentions_high(risk_level) else 0
+        return min(100, max(0, adjusted_score)), flags
 
-    def _score_copyright_risk(self, copyright_data: Dict[str, Any]) -> float:
-        """著作権リスクスコア"""
+    def _score_copyright_risk(self, copyright_data: Dict[str, Any]) -> Tuple[float, int]:
+        """著作権リスクスコアと著作権侵害のリスクビット"""
         if not copyright_data:
-            return 30.0
+            return 30.0, 0
 
-        probability = copyright_data.get('probability', '').lower()
+        probability = copyright_data.get('probability', '')
         confidence = copyright_data.get('confidence', 0.5)
 
-        if '高' in probability or 'high' in probability:
-            base_score = 85.0
-        elif '中' in probability or 'medium' in probability:
-            base_score = 55.0
-        else:
-            base_score = 15.0
+        base_score = _COPYRIGHT_SCORES[_classify_level(probability, _RISK_LEVELS)]
 
-        return base_score * confidence + 30.0 * (1 - confidence)
+        flags = _RISK_COPYRIGHT if _mentions_high(probability) else 0
+        return base_score * confidence + 30.0 * (1 - confidence), flags
 
     def _score_commercial_use(self, commercial_data: Dict[str, Any]) -> float:
         """商用利用スコア"""
         if not commercial_data:
             return 30.0
 
-        status = commercial_data.get('status', '').lower()
-
-        if '無許可' in status or 'unauthorized' in status:
-            return 70.0
-        elif '商用' in status or 'commercial' in status:
-            return 50.0
-        else:
-            return 20.0
+        status = commercial_data.get('status', '')
+        return _COMMERCIAL_SCORES[_classify_level(status, _COMMERCIAL_LEVELS)]
 
     def _score_content_quality(self, modification_data: Dict[str, Any]) -> float:
         """コンテンツ品質スコア"""
         if not modification_data:
             return 30.0
 
-        level = modification_data.get('level', '').lower()
+        level = modification_data.get('level', '')
+        return _MODIFICATION_SCORES[_classify_level(level, _MODIFICATION_LEVELS)]
 
-        if '大幅' in level or 'major' in level:
-            return 70.0
-        elif '軽微' in level or 'minor' in level:
-            return 40.0
-        else:
-            return 20.0
-
-    def _score_search_ranking(self, ranking: int) -> float:
-        """検索順位スコア（上位ほど信頼度高）"""
+    def _score_search_ranking(self, ranking: int) -> Tuple[float, int]:
+        """検索順位スコア（上位ほど信頼度高）と低順位のリスクビット"""
         if ranking <= 0:
-            return 50.0
+            return 50.0, 0
 
-        if ranking <= 3:
-            return 10.0  # トップ3は信頼度高
-        elif ranking <= 10:
-            return 25.0
-        elif ranking <= 20:
-            return 40.0
-        elif ranking <= 50:
-            return 60.0
-        else:
-            return 80.0  # 低順位は要注意
+        # トップ3は信頼度高、50位超の低順位は要注意
+        return (
+            _RANKING_SCORES[bisect.bisect_left(_RANKING_THRESHOLDS, ranking)],
+            _RISK_LOW_RANKING if ranking > 50 else 0
+        )
 
     def _score_content_similarity(self, similarity: float) -> float:
-        """コンテンツ類似度スコア"""
-        if similarity >= 0.9:
-            return 20.0  # 高い類似度は信頼度高
-        elif similarity >= 0.7:
-            return 35.0
-        elif similarity >= 0.5:
-            return 50.0
-        elif similarity >= 0.3:
-            return 70.0
-        else:
-            return 85.0  # 低い類似度は要注意
+        """コンテンツ類似度スコア（高い類似度は信頼度高、低い類似度は要注意）"""
+        return _SIMILARITY_SCORES[bisect.bisect_right(_SIMILARITY_THRESHOLDS, similarity)]
 
-    def _score_update_frequency(self, last_updated: Optional[str]) -> float:
+    def _score_update_frequency(self, last_updated: Optional[str], now_epoch: float) -> float:
         """更新頻度スコア"""
         if not last_updated:
             return 60.0
 
         try:
-            if isinstance(last_updated, str):
-                updated = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
-            else:
-                updated = last_updated
-
-            days_since_update = (datetime.utcnow() - updated.replace(tzinfo=None)).days
-
-            if days_since_update <= 7:
-                return 30.0  # 最近更新
-            elif days_since_update <= 30:
-                return 40.0
-            elif days_since_update <= 90:
-                return 55.0
-            elif days_since_update <= 365:
-                return 70.0
-            else:
-                return 85.0  # 長期間未更新
+            days_since_update = _days_since(last_updated, now_epoch)
+
+            # 最近更新: 30.0 〜 長期間未更新: 85.0
+            return _UPDATE_SCORES[bisect.bisect_left(_UPDATE_THRESHOLDS, days_since_update)]
 
         except Exception:
             return 60.0
@@ -463,14 +1297,8 @@ class ThreatScorer:
         # Alexaランクやトラフィック推定
         alexa_rank = traffic_data.get('alexa_rank', 0)
         if alexa_rank > 0:
-            if alexa_rank <= 10000:
-                return 10.0  # 人気サイト
-            elif alexa_rank <= 100000:
-                return 25.0
-            elif alexa_rank <= 1000000:
-                return 40.0
-            else:
-                return 60.0
+            # 人気サイトほど低スコア
+            return _TRAFFIC_SCORES[bisect.bisect_left(_TRAFFIC_THRESHOLDS, alexa_rank)]
 
         return 50.0
 
@@ -480,20 +1308,9 @@ class ThreatScorer:
             return 50.0
 
         # SNSでのシェア数
-        total_shares = sum([
-            social_data.get('facebook_shares', 0),
-            social_data.get('twitter_shares', 0),
-            social_data.get('linkedin_shares', 0)
-        ])
+        total_shares = self._total_shares(social_data)
 
-        if total_shares > 1000:
-            return 20.0
-        elif total_shares > 100:
-            return 35.0
-        elif total_shares > 10:
-            return 50.0
-        else:
-            return 70.0
+        return _SHARE_SCORES[bisect.bisect_left(_SHARE_THRESHOLDS, total_shares)]
 
     def _determine_threat_level(self, score: float) -> str:
         """スコアから脅威レベルを決定"""
@@ -508,87 +1325,31 @@ class ThreatScorer:
 
     def _calculate_confidence(self, domain_data: Dict, ai_analysis: Dict) -> float:
         """評価の信頼度を計算"""
-        confidence_factors = []
+        total = 0.0
+        count = 0
 
         # ドメインデータの完全性
         if domain_data.get('whois_info'):
-            confidence_factors.append(0.9)
+            total += 0.9
+            count += 1
         if domain_data.get('ssl_info'):
-            confidence_factors.append(0.8)
-
-        # AI分析の信頼度
-        for analysis in ai_analysis.values():
-            if isinstance(analysis, dict) and 'confidence' in analysis:
-                confidence_factors.append(analysis['confidence'])
-
-        if confidence_factors:
-            return sum(confidence_factors) / len(confidence_factors)
-        else:
-            return 0.5
-
-    def _identify_risk_factors(self, domain_data: Dict, ai_analysis: Dict,
-                            search_data: Dict, content_data: Dict) -> List[str]:
-        """リスク要因を特定"""
-        risk_factors = []
-
-        # ドメイン関連
-        if domain_data.get('creation_date'):
-            try:
-                creation = datetime.fromisoformat(domain_data['creation_date'].replace('Z', '+00:00'))
-                if (datetime.utcnow() - creation.replace(tzinfo=None)).days < 30:
-                    risk_factors.append('新規ドメイン（30日以内）')
-            except:
-                pass
-
-        ssl_info = domain_data.get('ssl_info', {})
-        if not ssl_info.get('has_ssl'):
-            risk_factors.append('SSL証明書なし')
-
-        # AI分析関連
-        abuse = ai_analysis.get('abuse_detection', {})
-        if 'high' in str(abuse.get('risk_level', '')).lower():
-            risk_factors.append('高い悪用リスク')
+            total += 0.8
+            count += 1
 
-        copyright = ai_analysis.get('copyright_infringement', {})
-        if 'high' in str(copyright.get('probability', '')).lower():
-            risk_factors.append('著作権侵害の可能性')
+        # AI分析の信頼度（スコアに使う4項目のみ参照）
+        for name in _AI_SECTIONS:
+            analysis = ai_analysis.get(name)
+            if isinstance(analysis, dict):
+                value = analysis.get('confidence')
+                if value is not None:
+                    total += value
+                    count += 1
 
-        # その他
-        ranking = search_data.get('ranking', 0)
-        if ranking > 50:
-            risk_factors.append('検索順位が低い')
-
-        similarity = content_data.get('similarity_score', 1.0)
-        if similarity < 0.3:
-            risk_factors.append('コンテンツ類似度が低い')
-
-        return risk_factors
+        return total / count if count else 0.5
 
     def _generate_recommendations(self, score: float, threat_level: str) -> List[str]:
-        """推奨アクションを生成"""
-        recommendations = []
-
-        if threat_level == 'HIGH':
-            recommendations.extend([
-                '即座に詳細調査を実施してください',
-                '著作権侵害の可能性があります',
-                '法的措置を検討してください'
-            ])
-        elif threat_level == 'MEDIUM':
-            recommendations.extend([
-                '追加の確認を推奨します',
-                'ドメイン所有者に連絡を検討してください',
-                '継続的な監視を設定してください'
-            ])
-        elif threat_level == 'LOW':
-            recommendations.extend([
-                '定期的な監視で十分です',
-                '必要に応じて追加調査を検討してください'
-            ])
-        else:
-            recommendations.append('現時点では特別な対応は不要です')
-
-        return recommendations
+        """推奨アクションを生成（結果ごとに変更できるようリストで返す）"""
+        return list(_RECOMMENDATIONS.get(threat_level, _DEFAULT_RECOMMENDATIONS))
 
     def _create_error_result(self, error_message: str) -> Dict[str, Any]:
         """エラー時のデフォルト結果を作成"""
@@ -600,7 +1361,20 @@ class ThreatScorer:
             'components': {},
             'risk_factors': ['評価エラーが発生しました'],
             'recommendations': ['手動での詳細確認を推奨します'],
-            'calculated_at': datetime.utcnow().isoformat()
+            'calculated_at': _iso_now()
+        }
+
+    def _create_low_confidence_result(self, confidence: float) -> Dict[str, Any]:
+        """信頼度不足で計算を省略した場合の結果を作成"""
+        return {
+            'overall_score': 50.0,
+            'threat_level': 'UNKNOWN',
+            'confidence': confidence,
+            'note': '評価に必要なデータが不足しているため詳細スコアを省略しました',
+            'components': {},
+            'risk_factors': ['評価データ不足'],
+            'recommendations': ['追加データを取得して再評価してください'],
+            'calculated_at': _iso_now()
         }
 
 
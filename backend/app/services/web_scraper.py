@@ -4,12 +4,17 @@ robots.txt対応・JavaScript対応のWebコンテンツ抽出
 """
 
 import asyncio
+import codecs
 import json
 import logging
+import os
 import re
+import socket
+import sqlite3
+import threading
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Union, Tuple, TYPE_CHECKING
+from typing import AsyncIterator, Dict, List, Optional, Union, Tuple, TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
 import httpx
@@ -18,6 +23,8 @@ import httpx
 if TYPE_CHECKING:
     import aiohttp
     from bs4 import BeautifulSoup, Comment
+    from protego import Protego
+    from selectolax.lexbor import LexborHTMLParser
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
@@ -35,12 +42,40 @@ try:
 except ImportError:
     AIOHTTP_AVAILABLE = False
 
+try:
+    import aiodns  # noqa: F401
+    from aiohttp.resolver import AsyncResolver
+    AIODNS_AVAILABLE = AIOHTTP_AVAILABLE
+except ImportError:
+    AIODNS_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
 try:
     from bs4 import BeautifulSoup, Comment
     BS4_AVAILABLE = True
 except ImportError:
     BS4_AVAILABLE = False
 
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# BeautifulSoupのパーサー（C実装のlxmlを優先し、未導入時は標準のhtml.parser）
+BS4_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
 try:
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
@@ -60,8 +95,81 @@ try:
 except ImportError:
     READABILITY_AVAILABLE = False
 
+try:
+    from protego import Protego
+    PROTEGO_AVAILABLE = True
+except ImportError:
+    PROTEGO_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import trafilatura
+    TRAFILATURA_AVAILABLE = True
+except ImportError:
+    TRAFILATURA_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    from charset_normalizer import from_bytes as detect_charset
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# テキスト整形・簡易抽出用の正規表現（呼び出しごとのキャッシュ参照を避けるため事前コンパイル）
+_WS_RE = re.compile(r'\s+')
+# 制御文字（C0・DEL・C1）の削除テーブル（str.translateで使用）
+_CTRL_DELETE_TABLE = dict.fromkeys([*range(0x00, 0x20), *range(0x7f, 0xa0)])
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_META_DESC_RE = re.compile(
+    r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']*)["\']', re.IGNORECASE
+)
+_TAG_RE = re.compile(r'<[^>]+>')
+# <meta charset="..."> / <meta http-equiv="Content-Type" content="...; charset=..."> の文字コード
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([A-Za-z0-9_.:\-]+)', re.IGNORECASE)
+
+# JSON-LDのパーサー（orjson.JSONDecodeErrorはjson.JSONDecodeErrorのサブクラス）
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _build_pattern_database(patterns: Tuple[str, ...]) -> Optional['hyperscan.Database']:
+    """
+    re.match相当（先頭アンカー・大文字小文字無視）のパターン群をHyperscanのDBにまとめる
+
+    Hyperscanが未導入、またはコンパイルできない場合はNone（reでの照合にフォールバック）
+    """
+    if not HYPERSCAN_AVAILABLE or not patterns:
+        return None
+
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[f'^(?:{pattern})'.encode('utf-8') for pattern in patterns],
+            ids=list(range(len(patterns))),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Hyperscan pattern compilation failed, using re: {e}")
+        return None
+
 
 class ScrapedContent:
     """スクレイピング結果を格納するデータクラス"""
@@ -90,16 +198,71 @@ class ScrapedContent:
 class WebScraper:
     """高機能Webスクレイピングクラス"""
 
-    def __init__(self):
+    # JavaScriptが必要なサイトのパターン
+    js_required_patterns = (
+        r'.*\.react\..*',
+        r'.*\.angular\..*',
+        r'.*\.vue\..*',
+        r'.*spa\..*',
+        r'.*app\..*'
+    )
+    _JS_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in js_required_patterns)
+    _JS_PATTERN_DB = _build_pattern_database(js_required_patterns)
+
+    # JavaScript必須と判定する属性（タグ内の属性名としてのみ一致させ、本文中の "landing-app" 等は除外）と、
+    # 検索対象とする先頭文字数
+    JS_FINGERPRINT_RE = re.compile(r'<[^>]*\s(?:data-reactroot|ng-app|v-app)[\s=/>]')
+    JS_FINGERPRINT_SCAN_LENGTH = 200000
+
+    # c-ares（aiodns）で名前解決する際のネームサーバー
+    dns_nameservers = ('1.1.1.1', '8.8.8.8')
+
+    # robots.txtの取得に失敗したドメインを再取得しない期間（秒）
+    ROBOTS_NEGATIVE_TTL = 60
+
+    # 永続robots.txtキャッシュの有効期間（秒）
+    ROBOTS_DISK_TTL = 24 * 60 * 60
+
+    # レスポンス本文の読み込み単位（バイト）
+    READ_CHUNK_SIZE = 64 * 1024
+
+    # Content-Typeに文字コードがない場合に<meta charset>を探す先頭バイト数
+    CHARSET_SNIFF_LENGTH = 4096
+
+    # Seleniumドライバープールの上限数と、1ドライバーあたりの再利用回数（Chromeのメモリ肥大対策）
+    SELENIUM_POOL_SIZE = 3
+    SELENIUM_MAX_USES = 50
+
+    # 解決済みのChromeDriverパス（プロセス内で共有し、webdriver-managerの確認・展開は初回のみ）
+    _chromedriver_path: Optional[str] = None
+    _chromedriver_lock = threading.Lock()
+
+    def __init__(self, robots_cache_path: Optional[str] = None):
+        """
+        Args:
+            robots_cache_path: robots.txtを永続化するSQLiteファイルのパス（Noneで無効）
+        """
         self.session = None
-        self.driver = None
+        # Seleniumドライバープール（アイドル中のドライバーと使用回数）
+        self._idle_drivers: List = []
+        self._driver_uses: Dict = {}
+        self._driver_slots: Optional[asyncio.Semaphore] = None
         self.user_agent = (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
             "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 ABDSBot/1.0"
         )
         self.timeout = 30
         self.max_content_length = 10 * 1024 * 1024  # 10MB
-        self.robots_cache: Dict[str, RobotFileParser] = {}
+        # ドメイン -> (robots.txtパーサーを返すFuture（None=全許可）, 有効期限)
+        self.robots_cache: Dict[str, Tuple[asyncio.Future, float]] = {}
+        self.robots_cache_path = robots_cache_path
+        self._robots_db: Optional[sqlite3.Connection] = None
+
+        if robots_cache_path:
+            try:
+                self._robots_db = self._open_robots_db(robots_cache_path)
+            except Exception as e:
+                logger.warning(f"robots.txt cache database unavailable ({robots_cache_path}): {e}")
 
         # スクレイピング対象の除外パターン
         self.excluded_domains = {
@@ -108,15 +271,6 @@ class WebScraper:
             'linkedin.com', 'tiktok.com', 'youtube.com'
         }
 
-        # JavaScriptが必要なサイトのパターン
-        self.js_required_patterns = [
-            r'.*\.react\..*',
-            r'.*\.angular\..*',
-            r'.*\.vue\..*',
-            r'.*spa\..*',
-            r'.*app\..*'
-        ]
-
     async def __aenter__(self):
         """非同期コンテキストマネージャーの開始"""
         await self._init_session()
@@ -129,11 +283,18 @@ class WebScraper:
     async def _init_session(self):
         """HTTPセッションの初期化"""
         if AIOHTTP_AVAILABLE:
+            connector_options = {}
+            if AIODNS_AVAILABLE:
+                # スレッドプールのgetaddrinfoではなくc-aresでイベントループ上で名前解決
+                connector_options['resolver'] = AsyncResolver(nameservers=list(self.dns_nameservers))
+                connector_options['family'] = socket.AF_INET
+
             connector = aiohttp.TCPConnector(
                 limit=100,
                 limit_per_host=10,
                 ttl_dns_cache=300,
                 use_dns_cache=True,
+                **connector_options
             )
 
             timeout = aiohttp.ClientTimeout(total=self.timeout)
@@ -154,8 +315,19 @@ class WebScraper:
                 headers=headers
             )
         else:
-            # httpxを代替として使用
+            # httpxを代替として使用（h2導入時はHTTP/2で同一ホストへの要求を多重化）
+            # transportを渡すとクライアント側のhttp2/limitsは無視されるため、transportに設定する
+            transport = httpx.AsyncHTTPTransport(
+                http2=H2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=100,
+                    max_connections=200,
+                    keepalive_expiry=300.0
+                ),
+                retries=1
+            )
             self.session = httpx.AsyncClient(
+                transport=transport,
                 timeout=self.timeout,
                 headers={
                     'User-Agent': self.user_agent,
@@ -175,11 +347,52 @@ class WebScraper:
                 await self.session.close()
             else:
                 await self.session.aclose()
-        if self.driver and SELENIUM_AVAILABLE:
-            try:
-                self.driver.quit()
-            except Exception as e:
-                logger.warning(f"Driver cleanup error: {e}")
+        if self._robots_db is not None:
+            self._robots_db.close()
+            self._robots_db = None
+        if SELENIUM_AVAILABLE:
+            for driver in list(self._driver_uses):
+                self._quit_driver(driver)
+            self._idle_drivers.clear()
+            self._driver_uses.clear()
+
+    def _quit_driver(self, driver):
+        """Seleniumドライバーの終了"""
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Driver cleanup error: {e}")
+
+    async def _acquire_driver(self):
+        """プールからドライバーを取得（空きがなければ上限数まで新規作成）"""
+        if self._driver_slots is None:
+            self._driver_slots = asyncio.Semaphore(self.SELENIUM_POOL_SIZE)
+
+        await self._driver_slots.acquire()
+        try:
+            if self._idle_drivers:
+                return self._idle_drivers.pop()
+
+            loop = asyncio.get_running_loop()
+            driver = await loop.run_in_executor(None, self._init_selenium_driver)
+            self._driver_uses[driver] = 0
+            return driver
+        except BaseException:
+            self._driver_slots.release()
+            raise
+
+    def _release_driver(self, driver, broken: bool = False):
+        """ドライバーをプールへ返却（異常時・再利用上限到達時は破棄）"""
+        try:
+            uses = self._driver_uses.get(driver, 0) + 1
+            if broken or uses >= self.SELENIUM_MAX_USES:
+                self._driver_uses.pop(driver, None)
+                asyncio.get_running_loop().run_in_executor(None, self._quit_driver, driver)
+            else:
+                self._driver_uses[driver] = uses
+                self._idle_drivers.append(driver)
+        finally:
+            self._driver_slots.release()
 
     def _init_selenium_driver(self):
         """Seleniumドライバーの初期化"""
@@ -204,7 +417,7 @@ class WebScraper:
             options.add_argument('--memory-pressure-off')
             options.add_argument('--max_old_space_size=4096')
 
-            service = Service(ChromeDriverManager().install())
+            service = Service(self._resolve_chromedriver_path())
             driver = webdriver.Chrome(service=service, options=options)
             driver.set_page_load_timeout(self.timeout)
 
@@ -214,68 +427,224 @@ class WebScraper:
             logger.error(f"Selenium driver initialization failed: {e}")
             raise
 
+    @classmethod
+    def install_uvloop(cls) -> bool:
+        """
+        イベントループポリシーをuvloopに切り替える（プロセス全体に影響するため呼び出し側が明示的に選択）
+
+        イベントループ生成前（asyncio.run等の前）に呼び出すこと
+
+        Returns:
+            bool: uvloopを適用できた場合True
+        """
+        if not UVLOOP_AVAILABLE:
+            logger.info("uvloop is not available, keeping the default event loop")
+            return False
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        return True
+
+    @classmethod
+    def _resolve_chromedriver_path(cls) -> str:
+        """ChromeDriverのパスを取得（環境変数CHROMEDRIVER_PATHを優先）"""
+        if cls._chromedriver_path is None:
+            with cls._chromedriver_lock:
+                if cls._chromedriver_path is None:
+                    WebScraper._chromedriver_path = (
+                        os.environ.get('CHROMEDRIVER_PATH') or ChromeDriverManager().install()
+                    )
+        return cls._chromedriver_path
+
+    @staticmethod
+    def _parse(html_content: str) -> 'LexborHTMLParser':
+        """selectolax（Lexbor）でHTMLをパース"""
+        return LexborHTMLParser(html_content)
+
+    @classmethod
+    def _parse_document(cls, html_content: str):
+        """HTMLをパース（selectolaxを優先し、次にBeautifulSoup。どちらも未導入ならNone）"""
+        if SELECTOLAX_AVAILABLE:
+            return cls._parse(html_content)
+        if BS4_AVAILABLE:
+            return BeautifulSoup(html_content, BS4_PARSER)
+        return None
+
+    @staticmethod
+    def _is_lexbor(doc) -> bool:
+        """パース結果がselectolaxのツリーかどうか"""
+        return SELECTOLAX_AVAILABLE and isinstance(doc, LexborHTMLParser)
+
+    @staticmethod
+    def _lexbor_text(tree: 'LexborHTMLParser') -> str:
+        """script/styleを除いた本文テキストをC実装で一括取得（ノード間は空白で区切る）"""
+        tree.strip_tags(['script', 'style'])
+        node = tree.body if tree.body is not None else tree.root
+        if node is None:
+            return ''
+        return node.text(deep=True, separator=' ', strip=True)
+
+    @staticmethod
+    def _attr(node, name: str) -> str:
+        """selectolaxノードの属性値（値なし属性・未指定は空文字）"""
+        return node.attributes.get(name) or ''
+
+    @staticmethod
+    def _open_robots_db(cache_path: str) -> sqlite3.Connection:
+        """永続robots.txtキャッシュのSQLiteを開いてテーブルを用意"""
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(cache_path, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        # contentがNULLの行はrobots.txtが存在しない（全許可）ことを表す
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS robots('
+            'domain TEXT PRIMARY KEY, content TEXT, fetched_at INTEGER NOT NULL)'
+        )
+        return conn
+
+    def _robots_db_get(self, domain: str) -> Optional[Tuple[Optional[str]]]:
+        """永続キャッシュから有効期間内のrobots.txtを取得（未登録・期限切れはNone）"""
+        try:
+            row = self._robots_db.execute(
+                'SELECT content FROM robots WHERE domain = ? AND fetched_at >= ?',
+                (domain, int(time.time()) - self.ROBOTS_DISK_TTL)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"robots.txt cache read failed: {e}")
+            return None
+        return row
+
+    def _robots_db_put(self, domain: str, content: Optional[str]) -> None:
+        """永続キャッシュにrobots.txtを保存"""
+        try:
+            self._robots_db.execute(
+                'INSERT OR REPLACE INTO robots(domain, content, fetched_at) VALUES (?, ?, ?)',
+                (domain, content, int(time.time()))
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"robots.txt cache write failed: {e}")
+
+    async def _fetch_robots_txt(self, domain: str) -> Tuple[Optional[Union['Protego', RobotFileParser]], float]:
+        """
+        robots.txtを取得してパース（永続キャッシュが有効なら先に参照）
+
+        Returns:
+            (Protego/RobotFileParser（None=全許可）, キャッシュの有効秒数)
+        """
+        robots_url = urljoin(domain, '/robots.txt')
+
+        if self._robots_db is not None:
+            row = self._robots_db_get(domain)
+            if row is not None:
+                robots_content = row[0]
+                if robots_content is None:
+                    return None, float('inf')
+                return self._parse_robots_txt(robots_url, robots_content), float('inf')
+
+        try:
+            if AIOHTTP_AVAILABLE:
+                async with self.session.get(robots_url, timeout=10) as response:
+                    robots_content = await response.text() if response.status == 200 else None
+            else:
+                response = await self.session.get(robots_url, timeout=10)
+                robots_content = response.text if response.status_code == 200 else None
+        except Exception as e:
+            logger.debug(f"robots.txt fetch failed for {domain}: {e}")
+            return None, self.ROBOTS_NEGATIVE_TTL
+
+        if self._robots_db is not None:
+            self._robots_db_put(domain, robots_content)
+
+        if robots_content is None:
+            # robots.txtが見つからない場合は許可とみなす
+            return None, float('inf')
+
+        return self._parse_robots_txt(robots_url, robots_content), float('inf')
+
+    @staticmethod
+    def _parse_robots_txt(robots_url: str, robots_content: str) -> Union['Protego', RobotFileParser]:
+        """robots.txtをパース（Protegoを優先し、未導入時は標準のRobotFileParser）"""
+        if PROTEGO_AVAILABLE:
+            return Protego.parse(robots_content)
+
+        rp = RobotFileParser()
+        rp.set_url(robots_url)
+        rp.parse(robots_content.splitlines())
+        return rp
+
+    @staticmethod
+    def _robots_allows(rp: Union['Protego', RobotFileParser], url: str) -> bool:
+        """ABDSBotまたは全User-Agent向けの規則でアクセスが許可されているか"""
+        if PROTEGO_AVAILABLE and isinstance(rp, Protego):
+            return rp.can_fetch(url, 'ABDSBot') or rp.can_fetch(url, '*')
+        return rp.can_fetch('ABDSBot', url) or rp.can_fetch('*', url)
+
     async def _check_robots_txt(self, url: str) -> bool:
         """robots.txtをチェックしてアクセス許可を確認"""
         try:
             parsed_url = urlparse(url)
             domain = f"{parsed_url.scheme}://{parsed_url.netloc}"
 
-            # キャッシュチェック
-            if domain in self.robots_cache:
-                rp = self.robots_cache[domain]
+            # キャッシュチェック（取得中のドメインは同じFutureを待ち、取得を1回にまとめる）
+            entry = self.robots_cache.get(domain)
+            if entry is not None and entry[1] > time.monotonic():
+                rp = await asyncio.shield(entry[0])
             else:
-                rp = RobotFileParser()
-                robots_url = urljoin(domain, '/robots.txt')
-
+                future = asyncio.get_running_loop().create_future()
+                self.robots_cache[domain] = (future, float('inf'))
                 try:
-                    if AIOHTTP_AVAILABLE:
-                        async with self.session.get(robots_url, timeout=10) as response:
-                            if response.status == 200:
-                                robots_content = await response.text()
-                                rp.set_url(robots_url)
-                                rp.feed(robots_content)
-                            else:
-                                # robots.txtが見つからない場合は許可とみなす
-                                return True
-                    else:
-                        response = await self.session.get(robots_url, timeout=10)
-                        if response.status_code == 200:
-                            robots_content = response.text
-                            rp.set_url(robots_url)
-                            rp.feed(robots_content)
-                        else:
-                            # robots.txtが見つからない場合は許可とみなす
-                            return True
-                except Exception as e:
-                    logger.debug(f"robots.txt fetch failed for {domain}: {e}")
-                    return True
-
-                self.robots_cache[domain] = rp
+                    rp, ttl = await self._fetch_robots_txt(domain)
+                except BaseException:
+                    # 待機中の呼び出し元は許可扱いとし、次回は再取得
+                    self.robots_cache.pop(domain, None)
+                    future.set_result(None)
+                    raise
+                self.robots_cache[domain] = (future, time.monotonic() + ttl)
+                future.set_result(rp)
+
+            if rp is None:
+                return True
 
             # User-Agentに基づいてアクセス許可をチェック
-            return rp.can_fetch('ABDSBot', url) or rp.can_fetch('*', url)
+            return self._robots_allows(rp, url)
 
         except Exception as e:
             logger.warning(f"robots.txt check failed for {url}: {e}")
             return True
 
-    def _is_javascript_required(self, url: str, html_content: str) -> bool:
-        """JavaScriptレンダリングが必要かどうかを判定"""
+    def _is_javascript_required(self, url: str, html_content: str, doc=None) -> bool:
+        """
+        JavaScriptレンダリングが必要かどうかを判定
+
+        Args:
+            doc: _parse_documentでパース済みのツリー（Noneならhtml_contentをパース）
+        """
         try:
             # Seleniumが利用できない場合は常にFalse
             if not SELENIUM_AVAILABLE:
                 return False
 
             # URLパターンによる判定
-            for pattern in self.js_required_patterns:
-                if re.match(pattern, url, re.IGNORECASE):
-                    return True
+            if self._matches_js_pattern(url):
+                return True
 
             # HTMLコンテンツによる判定
-            if not html_content or not BS4_AVAILABLE:
+            if not html_content:
                 return False
 
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # ツリーを辿る前に生HTMLの部分文字列検索で明らかなケースを判定
+            if self._has_js_fingerprint(html_content):
+                return True
+
+            soup = doc if doc is not None else self._parse_document(html_content)
+            if soup is None:
+                return False
+
+            if self._is_lexbor(soup):
+                return self._is_javascript_required_lexbor(soup)
 
             # 明らかにJavaScriptが必要な場合
             js_indicators = [
@@ -302,6 +671,101 @@ class WebScraper:
             logger.warning(f"JavaScript requirement check failed: {e}")
             return False
 
+    @classmethod
+    def _has_js_fingerprint(cls, html_content: str) -> bool:
+        """生HTMLにSPAフレームワークの属性・多数のscriptタグがあるか（パースせず正規表現検索のみ）"""
+        head = html_content[:cls.JS_FINGERPRINT_SCAN_LENGTH].lower()
+        if head.count('<script') > 10:
+            return True
+        return cls.JS_FINGERPRINT_RE.search(head) is not None
+
+    def _matches_js_pattern(self, url: str) -> bool:
+        """URLがJavaScript必須パターンのいずれかに一致するか（Hyperscanなら1回の走査で判定）"""
+        if self._JS_PATTERN_DB is not None:
+            matched = []
+
+            def on_match(pattern_id, start, end, flags, context):
+                matched.append(pattern_id)
+
+            self._JS_PATTERN_DB.scan(url.encode('utf-8'), match_event_handler=on_match)
+            return bool(matched)
+
+        return any(pattern.match(url) for pattern in self._JS_PATTERNS)
+
+    def _is_javascript_required_lexbor(self, tree: 'LexborHTMLParser') -> bool:
+        """HTMLコンテンツによるJavaScript要否判定（selectolax版）"""
+        script_tags = tree.css('script')
+
+        # スクリプトタグが多い場合
+        if len(script_tags) > 10:
+            return True
+
+        # コンテンツが少なすぎる場合
+        root = tree.root
+        text_content = root.text(strip=True) if root is not None else ''
+        if len(text_content) < 500:
+            return True
+
+        # 明らかにJavaScriptが必要な場合
+        for script in script_tags:
+            if 'src' in script.attributes:
+                return True
+            text = script.text().lower()
+            if 'react' in text or 'angular' in text or 'vue' in text:
+                return True
+
+        return bool(
+            tree.css_first('[data-reactroot]') or
+            tree.css_first('[ng-app]') or
+            tree.css_first('[v-app]')
+        )
+
+    async def _read_capped(self, chunks: AsyncIterator[bytes]) -> bytes:
+        """レスポンス本文をmax_content_lengthを上限に読み込む（超過時は即座に中断）"""
+        buffer = []
+        total = 0
+        async for chunk in chunks:
+            total += len(chunk)
+            if total > self.max_content_length:
+                raise Exception(f"Content too large: exceeded {self.max_content_length} bytes")
+            buffer.append(chunk)
+        return b''.join(buffer)
+
+    @classmethod
+    def _decode_html(cls, body: bytes, declared_charset: Optional[str]) -> Tuple[str, str]:
+        """
+        レスポンス本文を文字列に変換し、(HTML, 使用した文字コード)を返す
+
+        文字コードはContent-Type、先頭の<meta charset>の順に採用する。どちらにも宣言がない場合は
+        UTF-8として厳密にデコードし、失敗したらcharset_normalizerで推定する。推定もできない場合は
+        UnicodeDecodeErrorを送出し、文字化けしたテキストをスコアリングに渡さない。
+        """
+        charset = declared_charset
+        if not charset:
+            match = _META_CHARSET_RE.search(body, 0, cls.CHARSET_SNIFF_LENGTH)
+            if match:
+                charset = match.group(1).decode('ascii')
+
+        if charset:
+            try:
+                codecs.lookup(charset)
+            except LookupError:
+                charset = None
+            else:
+                # 宣言された文字コードでは一部の不正バイトのみ置換する
+                return body.decode(charset, errors='replace'), charset
+
+        try:
+            return body.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            if not CHARSET_NORMALIZER_AVAILABLE:
+                raise
+
+        best = detect_charset(body).best()
+        if best is None:
+            raise UnicodeDecodeError('utf-8', body, 0, len(body), 'undetectable character encoding')
+        return str(best), best.encoding
+
     async def _fetch_with_requests(self, url: str) -> Tuple[str, Dict]:
         """通常のHTTPリクエストでコンテンツを取得"""
         try:
@@ -318,68 +782,75 @@ class WebScraper:
                     if content_length > self.max_content_length:
                         raise Exception(f"Content too large: {content_length} bytes")
 
-                    html_content = await response.text()
+                    # ヘッダーが欠落・虚偽の場合に備え、本文は上限付きでストリーミング読み込み
+                    body = await self._read_capped(response.content.iter_chunked(self.READ_CHUNK_SIZE))
+                    html_content, encoding = self._decode_html(body, response.charset)
 
                     metadata = {
                         'status_code': response.status,
                         'content_type': content_type,
                         'content_length': len(html_content),
-                        'encoding': response.charset or 'utf-8',
+                        'encoding': encoding,
                         'final_url': str(response.url)
                     }
 
                     return html_content, metadata
             else:
                 # httpxを使用
-                response = await self.session.get(url, follow_redirects=True)
-                if response.status_code != 200:
-                    raise Exception(f"HTTP {response.status_code}: {response.reason_phrase}")
-
-                content_type = response.headers.get('content-type', '')
-                if not content_type.startswith('text/html'):
-                    raise Exception(f"Unsupported content type: {content_type}")
-
-                content_length = int(response.headers.get('content-length', 0))
-                if content_length > self.max_content_length:
-                    raise Exception(f"Content too large: {content_length} bytes")
-
-                html_content = response.text
-
-                metadata = {
-                    'status_code': response.status_code,
-                    'content_type': content_type,
-                    'content_length': len(html_content),
-                    'encoding': response.encoding or 'utf-8',
-                    'final_url': str(response.url)
-                }
+                async with self.session.stream('GET', url, follow_redirects=True) as response:
+                    if response.status_code != 200:
+                        raise Exception(f"HTTP {response.status_code}: {response.reason_phrase}")
+
+                    content_type = response.headers.get('content-type', '')
+                    if not content_type.startswith('text/html'):
+                        raise Exception(f"Unsupported content type: {content_type}")
+
+                    content_length = int(response.headers.get('content-length', 0))
+                    if content_length > self.max_content_length:
+                        raise Exception(f"Content too large: {content_length} bytes")
+
+                    body = await self._read_capped(response.aiter_bytes(self.READ_CHUNK_SIZE))
+                    html_content, encoding = self._decode_html(body, response.charset_encoding)
+
+                    metadata = {
+                        'status_code': response.status_code,
+                        'content_type': content_type,
+                        'content_length': len(html_content),
+                        'encoding': encoding,
+                        'final_url': str(response.url)
+                    }
 
-                return html_content, metadata
+                    return html_content, metadata
 
         except Exception as e:
             logger.error(f"HTTP fetch failed for {url}: {e}")
             raise
 
-    def _fetch_with_selenium(self, url: str) -> Tuple[str, Dict]:
-        """Seleniumを使用してJavaScriptレンダリング付きでコンテンツを取得"""
-        if not SELENIUM_AVAILABLE:
-            raise Exception("Selenium is not available")
+    def _selenium_get(self, driver, url: str) -> Tuple[str, str]:
+        """ドライバーでページを読み込み、HTMLと最終URLを返す（スレッドプール上で実行）"""
+        driver.get(url)
 
-        try:
-            if not self.driver:
-                self.driver = self._init_selenium_driver()
+        # ページの読み込み完了を待つ
+        WebDriverWait(driver, self.timeout).until(
+            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        )
 
-            self.driver.get(url)
+        # 動的コンテンツの読み込みを待つ
+        time.sleep(2)
 
-            # ページの読み込み完了を待つ
-            WebDriverWait(self.driver, self.timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+        return driver.page_source, driver.current_url
 
-            # 動的コンテンツの読み込みを待つ
-            time.sleep(2)
+    async def _fetch_with_selenium(self, url: str) -> Tuple[str, Dict]:
+        """Seleniumを使用してJavaScriptレンダリング付きでコンテンツを取得"""
+        if not SELENIUM_AVAILABLE:
+            raise Exception("Selenium is not available")
 
-            html_content = self.driver.page_source
-            current_url = self.driver.current_url
+        driver = None
+        broken = False
+        try:
+            driver = await self._acquire_driver()
+            loop = asyncio.get_running_loop()
+            html_content, current_url = await loop.run_in_executor(None, self._selenium_get, driver, url)
 
             metadata = {
                 'status_code': 200,  # Seleniumでは正確なステータスコードが取得できない
@@ -393,75 +864,83 @@ class WebScraper:
             return html_content, metadata
 
         except Exception as e:
-            if SELENIUM_AVAILABLE and isinstance(e, (TimeoutException, WebDriverException)):
-                if isinstance(e, TimeoutException):
-                    raise Exception("Page load timeout")
-                else:
-                    raise Exception(f"Selenium error: {e}")
-            else:
-                raise Exception(f"Selenium error: {e}")
+            if isinstance(e, TimeoutException):
+                raise Exception("Page load timeout")
+            # タイムアウト以外のエラーではドライバーの状態が不明なため破棄
+            broken = True
+            raise Exception(f"Selenium error: {e}")
+        finally:
+            if driver is not None:
+                self._release_driver(driver, broken)
+
+    def _extract_structured_data(
+        self,
+        soup,
+        og_data: Optional[Dict[str, str]] = None,
+        twitter_data: Optional[Dict[str, str]] = None
+    ) -> List[Dict]:
+        """
+        構造化データ（JSON-LD・Open Graph・Twitter Card）を抽出
 
-    def _extract_structured_data(self, soup) -> List[Dict]:
-        """構造化データ（JSON-LD）を抽出"""
+        og_data/twitter_dataに_extract_all_metaの結果を渡すと、metaタグの再走査を省略する
+        """
         structured_data = []
 
-        if not BS4_AVAILABLE:
+        if og_data is None or twitter_data is None:
+            _, og_data, twitter_data = self._extract_all_meta(soup)
+
+        lexbor = self._is_lexbor(soup)
+        if not lexbor and not BS4_AVAILABLE:
             return structured_data
 
         try:
             # JSON-LD形式の構造化データ
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-
-            for script in json_ld_scripts:
+            if lexbor:
+                json_ld_texts = (script.text() for script in soup.css('script[type="application/ld+json"]'))
+            else:
+                # NavigableStringはstrのサブクラスでorjsonが受け付けないためstrへ変換
+                json_ld_texts = (
+                    str(script.string) if script.string else ''
+                    for script in soup.find_all('script', type='application/ld+json')
+                )
+
+            for text in json_ld_texts:
+                if not text:
+                    continue
                 try:
-                    if script.string:
-                        data = json.loads(script.string)
-                        structured_data.append({
-                            'type': 'json-ld',
-                            'data': data
-                        })
+                    structured_data.append({
+                        'type': 'json-ld',
+                        'data': _json_loads(text)
+                    })
                 except json.JSONDecodeError:
                     continue
 
-            # Open Graph メタデータ
-            og_data = {}
-            og_tags = soup.find_all('meta', property=lambda x: x and x.startswith('og:'))
-            for tag in og_tags:
-                property_name = tag.get('property', '').replace('og:', '')
-                content = tag.get('content', '')
-                if property_name and content:
-                    og_data[property_name] = content
-
-            if og_data:
-                structured_data.append({
-                    'type': 'open-graph',
-                    'data': og_data
-                })
-
-            # Twitter Card メタデータ
-            twitter_data = {}
-            twitter_tags = soup.find_all('meta', attrs={'name': lambda x: x and x.startswith('twitter:')})
-            for tag in twitter_tags:
-                name = tag.get('name', '').replace('twitter:', '')
-                content = tag.get('content', '')
-                if name and content:
-                    twitter_data[name] = content
-
-            if twitter_data:
-                structured_data.append({
-                    'type': 'twitter-card',
-                    'data': twitter_data
-                })
-
         except Exception as e:
             logger.warning(f"Structured data extraction failed: {e}")
 
+        # Open Graph メタデータ
+        if og_data:
+            structured_data.append({
+                'type': 'open-graph',
+                'data': og_data
+            })
+
+        # Twitter Card メタデータ
+        if twitter_data:
+            structured_data.append({
+                'type': 'twitter-card',
+                'data': twitter_data
+            })
+
         return structured_data
 
     def _extract_images(self, soup, base_url: str) -> List[Dict[str, str]]:
         """画像とalt属性を抽出"""
         images = []
 
+        if self._is_lexbor(soup):
+            return self._extract_images_lexbor(soup, base_url)
+
         if not BS4_AVAILABLE:
             return images
 
@@ -490,40 +969,132 @@ class WebScraper:
 
         return images
 
+    def _extract_images_lexbor(self, tree: 'LexborHTMLParser', base_url: str) -> List[Dict[str, str]]:
+        """画像とalt属性を抽出（selectolax版）"""
+        images = []
+
+        try:
+            for img in tree.css('img'):
+                attributes = img.attributes
+                src = attributes.get('src') or ''
+
+                if src:
+                    images.append({
+                        'src': urljoin(base_url, src),
+                        'alt': attributes.get('alt') or '',
+                        'title': attributes.get('title') or '',
+                        'width': attributes.get('width') or '',
+                        'height': attributes.get('height') or ''
+                    })
+
+        except Exception as e:
+            logger.warning(f"Image extraction failed: {e}")
+
+        return images
+
     def _extract_meta_data(self, soup) -> Dict[str, str]:
         """メタデータを抽出"""
+        meta_data, _, _ = self._extract_all_meta(soup)
+        return meta_data
+
+    def _extract_all_meta(self, soup) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
+        """
+        metaタグを1回の走査で一般メタデータ・Open Graph・Twitter Cardに振り分ける
+
+        Returns:
+            (meta_data, og_data, twitter_data)
+        """
         meta_data = {}
+        og_data = {}
+        twitter_data = {}
 
-        if not BS4_AVAILABLE:
-            return meta_data
+        lexbor = self._is_lexbor(soup)
+        if not lexbor and not BS4_AVAILABLE:
+            return meta_data, og_data, twitter_data
 
         try:
-            # 基本的なメタタグ
-            meta_tags = soup.find_all('meta')
+            if lexbor:
+                meta_attributes = (tag.attributes for tag in soup.css('meta'))
+            else:
+                meta_attributes = (tag.attrs for tag in soup.find_all('meta'))
 
-            for tag in meta_tags:
-                name = tag.get('name', '') or tag.get('property', '') or tag.get('http-equiv', '')
-                content = tag.get('content', '')
+            for attributes in meta_attributes:
+                content = attributes.get('content') or ''
+                if not content:
+                    continue
+
+                name = attributes.get('name') or ''
+                property_name = attributes.get('property') or ''
+
+                # 基本的なメタタグ
+                key = name or property_name or attributes.get('http-equiv') or ''
+                if key:
+                    meta_data[key] = content
+
+                if property_name.startswith('og:'):
+                    og_key = property_name.replace('og:', '')
+                    if og_key:
+                        og_data[og_key] = content
 
-                if name and content:
-                    meta_data[name] = content
+                if name.startswith('twitter:'):
+                    twitter_key = name.replace('twitter:', '')
+                    if twitter_key:
+                        twitter_data[twitter_key] = content
 
             # 特別なメタデータ
-            canonical_link = soup.find('link', rel='canonical')
-            if canonical_link:
-                meta_data['canonical'] = canonical_link.get('href', '')
+            if lexbor:
+                canonical_link = soup.css_first('link[rel~="canonical"]')
+                if canonical_link is not None:
+                    meta_data['canonical'] = self._attr(canonical_link, 'href')
+            else:
+                canonical_link = soup.find('link', rel='canonical')
+                if canonical_link:
+                    meta_data['canonical'] = canonical_link.get('href', '')
 
             # 言語情報
-            html_tag = soup.find('html')
-            if html_tag:
-                lang = html_tag.get('lang', '')
-                if lang:
-                    meta_data['language'] = lang
+            if lexbor:
+                html_tag = soup.css_first('html')
+                lang = self._attr(html_tag, 'lang') if html_tag is not None else ''
+            else:
+                html_tag = soup.find('html')
+                lang = html_tag.get('lang', '') if html_tag else ''
+            if lang:
+                meta_data['language'] = lang
 
         except Exception as e:
             logger.warning(f"Meta data extraction failed: {e}")
 
-        return meta_data
+        return meta_data, og_data, twitter_data
+
+    def _extract_main_content(self, html_content: str) -> Optional[Tuple[str, str]]:
+        """
+        本文を抽出（trafilaturaを優先し、次にreadability）
+
+        Returns:
+            (content_text, clean_text)。どちらも利用できない・抽出できない場合はNone
+        """
+        if TRAFILATURA_AVAILABLE:
+            try:
+                text = trafilatura.extract(
+                    html_content,
+                    include_comments=False,
+                    include_tables=False,
+                    favor_precision=True
+                )
+                if text:
+                    text = self._clean_text(text)
+                    return text, text
+            except Exception as e:
+                logger.debug(f"trafilatura extraction failed: {e}")
+
+        if READABILITY_AVAILABLE:
+            try:
+                doc = Document(html_content)
+                return self._clean_text(doc.summary()), self._clean_text(doc.get_clean_html())
+            except Exception:
+                pass
+
+        return None
 
     def _clean_text(self, text: str) -> str:
         """テキストのクリーニング"""
@@ -531,14 +1102,31 @@ class WebScraper:
             return ""
 
         # 余分な空白を削除
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         # 先頭・末尾の空白を削除
         text = text.strip()
         # 制御文字を削除
-        text = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', text)
+        text = text.translate(_CTRL_DELETE_TABLE)
 
         return text
 
+    def _is_excluded_domain(self, parsed_url) -> bool:
+        """
+        除外ドメイン（サブドメイン・ポート指定を含む）かどうか
+
+        ホスト名の親ドメインを順に集合で引くため、除外ドメイン数に依存しない
+        """
+        host = parsed_url.hostname or parsed_url.netloc.lower()
+        if host in self.excluded_domains:
+            return True
+
+        dot = host.find('.')
+        while dot != -1:
+            if host[dot + 1:] in self.excluded_domains:
+                return True
+            dot = host.find('.', dot + 1)
+        return False
+
     async def fetch_content(self, url: str, use_javascript: Optional[bool] = None) -> ScrapedContent:
         """
         指定URLからコンテンツを抽出
@@ -555,12 +1143,12 @@ class WebScraper:
         start_time = time.time()
 
         try:
-            # URLの検証
+            # URLの検証（awaitを伴う処理より前に同期的に拒否する）
             parsed_url = urlparse(url)
             if not parsed_url.scheme or not parsed_url.netloc:
                 raise ValueError("Invalid URL format")
 
-            if parsed_url.netloc in self.excluded_domains:
+            if self._is_excluded_domain(parsed_url):
                 raise ValueError(f"Domain {parsed_url.netloc} is excluded from scraping")
 
             # セッションの初期化
@@ -575,6 +1163,8 @@ class WebScraper:
             # 最初に通常のHTTPリクエストを試行
             html_content = ""
             metadata = {}
+            # パース済みツリー（JavaScript判定と各種抽出で共有し、HTMLのパースは1回にする）
+            doc = None
 
             try:
                 html_content, metadata = await self._fetch_with_requests(url)
@@ -583,18 +1173,21 @@ class WebScraper:
                 # JavaScriptが必要かどうかを判定
                 needs_js = use_javascript
                 if needs_js is None:
-                    needs_js = self._is_javascript_required(url, html_content)
+                    doc = self._parse_document(html_content)
+                    needs_js = self._is_javascript_required(url, html_content, doc)
 
                 # JavaScriptレンダリングが必要な場合はSeleniumを使用
                 if needs_js:
                     logger.info(f"Using Selenium for JavaScript rendering: {url}")
-                    html_content, metadata = self._fetch_with_selenium(url)
+                    doc = None
+                    html_content, metadata = await self._fetch_with_selenium(url)
                     result.javascript_rendered = True
 
             except Exception as e:
                 # 通常のリクエストが失敗した場合はSeleniumを試行
                 logger.warning(f"HTTP request failed, trying Selenium: {e}")
-                html_content, metadata = self._fetch_with_selenium(url)
+                doc = None
+                html_content, metadata = await self._fetch_with_selenium(url)
                 result.javascript_rendered = True
 
             # メタデータをセット
@@ -603,9 +1196,37 @@ class WebScraper:
             result.content_length = metadata.get('content_length', 0)
             result.encoding = metadata.get('encoding', '')
 
-            # HTMLパース（BeautifulSoupが利用可能な場合のみ）
-            if BS4_AVAILABLE:
-                soup = BeautifulSoup(html_content, 'html.parser')
+            # HTMLパース（selectolaxを優先し、次にBeautifulSoup）
+            if doc is None:
+                doc = self._parse_document(html_content)
+
+            if self._is_lexbor(doc):
+                tree = doc
+
+                # タイトル抽出
+                title_tag = tree.css_first('title')
+                if title_tag is not None:
+                    result.title = self._clean_text(title_tag.text())
+
+                # メタディスクリプション抽出
+                meta_desc = tree.css_first('meta[name="description"]')
+                if meta_desc is not None:
+                    result.meta_description = self._clean_text(self._attr(meta_desc, 'content'))
+
+                # 画像・構造化データ・メタデータはscript除去前のツリーから抽出
+                result.images = self._extract_images(tree, url)
+                result.meta_data, og_data, twitter_data = self._extract_all_meta(tree)
+                result.structured_data = self._extract_structured_data(tree, og_data, twitter_data)
+
+                # 本文テキスト抽出（trafilatura、次にreadabilityを使用）
+                main_content = self._extract_main_content(html_content)
+                if main_content is not None:
+                    result.content_text, result.clean_text = main_content
+                else:
+                    # 通常のテキスト抽出
+                    result.content_text = self._clean_text(self._lexbor_text(tree))
+            elif doc is not None:
+                soup = doc
 
                 # タイトル抽出
                 title_tag = soup.find('title')
@@ -617,19 +1238,12 @@ class WebScraper:
                 if meta_desc:
                     result.meta_description = self._clean_text(meta_desc.get('content', ''))
 
-                # 本文テキスト抽出（readabilityを使用）
-                if READABILITY_AVAILABLE:
-                    try:
-                        doc = Document(html_content)
-                        result.content_text = self._clean_text(doc.summary())
-                        result.clean_text = self._clean_text(doc.get_clean_html())
-                    except Exception:
-                        # readabilityが失敗した場合は通常のテキスト抽出
-                        for script in soup(["script", "style"]):
-                            script.decompose()
-                        result.content_text = self._clean_text(soup.get_text())
+                # 本文テキスト抽出（trafilatura、次にreadabilityを使用）
+                main_content = self._extract_main_content(html_content)
+                if main_content is not None:
+                    result.content_text, result.clean_text = main_content
                 else:
-                    # readabilityが利用できない場合は通常のテキスト抽出
+                    # 抽出できない場合は通常のテキスト抽出
                     for script in soup(["script", "style"]):
                         script.decompose()
                     result.content_text = self._clean_text(soup.get_text())
@@ -637,27 +1251,23 @@ class WebScraper:
                 # 画像情報抽出
                 result.images = self._extract_images(soup, url)
 
-                # 構造化データ抽出
-                result.structured_data = self._extract_structured_data(soup)
-
-                # メタデータ抽出
-                result.meta_data = self._extract_meta_data(soup)
+                # メタデータ・構造化データ抽出（metaタグの走査は1回）
+                result.meta_data, og_data, twitter_data = self._extract_all_meta(soup)
+                result.structured_data = self._extract_structured_data(soup, og_data, twitter_data)
             else:
                 # BeautifulSoupが利用できない場合の簡易的な抽出
-                import re
-
                 # タイトル抽出
-                title_match = re.search(r'<title[^>]*>(.*?)</title>', html_content, re.IGNORECASE | re.DOTALL)
+                title_match = _TITLE_RE.search(html_content)
                 if title_match:
                     result.title = self._clean_text(title_match.group(1))
 
                 # メタディスクリプション抽出
-                meta_match = re.search(r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']*)["\']', html_content, re.IGNORECASE)
+                meta_match = _META_DESC_RE.search(html_content)
                 if meta_match:
                     result.meta_description = self._clean_text(meta_match.group(1))
 
                 # 簡易的なテキスト抽出
-                text_content = re.sub(r'<[^>]+>', '', html_content)
+                text_content = _TAG_RE.sub('', html_content)
                 result.content_text = self._clean_text(text_content)
 
             # 言語情報
@@ -676,7 +1286,11 @@ class WebScraper:
 
         return result
 
-    async def fetch_multiple(self, urls: List[str], max_concurrent: int = 5) -> List[ScrapedContent]:
+    async def fetch_multiple(
+        self,
+        urls: List[str],
+        max_concurrent: int = 5
+    ) -> List[Union[ScrapedContent, BaseException]]:
         """
         複数URLを並行してスクレイピング
 
@@ -685,16 +1299,29 @@ class WebScraper:
             max_concurrent: 最大同時実行数
 
         Returns:
-            List[ScrapedContent]: スクレイピング結果一覧
+            List[Union[ScrapedContent, BaseException]]: スクレイピング結果一覧
+                （URLごとの想定外の例外は結果として返し、他のURLの結果は失わない）
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
-
-        async def scrape_with_semaphore(url: str) -> ScrapedContent:
-            async with semaphore:
-                return await self.fetch_content(url)
+        # URL数に関わらずタスク数をmax_concurrentに抑えるワーカープール
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(urls):
+            queue.put_nowait(item)
+        results: List[Union[ScrapedContent, BaseException, None]] = [None] * len(urls)
+
+        async def worker():
+            while True:
+                try:
+                    index, url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    results[index] = await self.fetch_content(url)
+                except Exception as e:
+                    results[index] = e
 
-        tasks = [scrape_with_semaphore(url) for url in urls]
-        return await asyncio.gather(*tasks, return_exceptions=False)
+        workers = [asyncio.create_task(worker()) for _ in range(min(max_concurrent, len(urls)))]
+        await asyncio.gather(*workers, return_exceptions=True)
+        return results
 
 
 async def get_web_scraper() -> WebScraper:
@@ -9,10 +9,13 @@ from app.utils.file_handler import (
     sanitize_filename,
     save_uploaded_file,
     generate_unique_filename,
+    ensure_directory,
 )
 
 from app.utils.image_processor import (
     create_thumbnail,
+    create_thumbnail_async,
+    create_thumbnails_batch,
     get_image_info,
     validate_image_file,
 )
@@ -29,7 +32,10 @@ __all__ = [
     "sanitize_filename",
     "save_uploaded_file",
     "generate_unique_filename",
+    "ensure_directory",
     "create_thumbnail",
+    "create_thumbnail_async",
+    "create_thumbnails_batch",
     "get_image_info",
     "validate_image_file",
     "scan_file_for_virus",
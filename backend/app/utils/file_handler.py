@@ -4,15 +4,45 @@ ABDSシステム - ファイル処理ユーティリティ
 """
 
 import os
-import uuid
+import hashlib
 import re
+import secrets
+import time
 from pathlib import Path
-from typing import Tuple, Optional
-import magic
+from typing import Set, Tuple, Optional
+import aiofiles
 from fastapi import UploadFile, HTTPException
-from datetime import datetime
 
 from app.core.config import settings
+from app.utils.security import detect_mime_type, get_file_extension, invalidate_file_cache
+
+# アップロード保存時の読み書き単位（1リクエストあたりのメモリ使用量の上限）
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB
+
+# 作成済みを確認したディレクトリ（リクエストごとのstat/mkdirシステムコールを省く）
+_ensured_directories: Set[str] = set()
+
+# ファイル名に使用できない文字（\wは非ASCIIの文字も含むため、ASCII以外は正規表現で判定）
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\-_\.]')
+_UNDERSCORE_RUN = re.compile(r'_+')
+
+# ASCIIのみのファイル名用の置換テーブル（英数字・-_.以外を_に置換）
+_ASCII_FILENAME_TABLE = str.maketrans({
+    c: '_' for c in map(chr, range(128)) if _UNSAFE_FILENAME_CHARS.match(c)
+})
+
+
+def ensure_directory(directory: str) -> None:
+    """
+    ディレクトリが存在することを保証する（プロセス内で初回のみ作成を試みる）
+    
+    Args:
+        directory: ディレクトリのパス
+    """
+    if directory in _ensured_directories:
+        return
+    os.makedirs(directory, exist_ok=True)
+    _ensured_directories.add(directory)
 
 
 def sanitize_filename(filename: str) -> str:
@@ -26,10 +56,13 @@ def sanitize_filename(filename: str) -> str:
         サニタイズされたファイル名
     """
     # 基本的なサニタイズ
-    filename = re.sub(r'[^\w\-_\.]', '_', filename)
+    if filename.isascii():
+        filename = filename.translate(_ASCII_FILENAME_TABLE)
+    else:
+        filename = _UNSAFE_FILENAME_CHARS.sub('_', filename)
     
     # 連続するアンダースコアを単一に
-    filename = re.sub(r'_+', '_', filename)
+    filename = _UNDERSCORE_RUN.sub('_', filename)
     
     # 先頭・末尾のアンダースコア、ピリオドを除去
     filename = filename.strip('_.')
@@ -62,9 +95,13 @@ def generate_unique_filename(filename: str) -> str:
     # 拡張子を取得
     name_part, ext_part = os.path.splitext(safe_filename)
     
-    # タイムスタンプとUUIDを追加
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    unique_id = str(uuid.uuid4())[:8]
+    # タイムスタンプ（ローカル時刻）とランダムな8桁の16進数を追加
+    t = time.localtime()
+    timestamp = (
+        f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}_"
+        f"{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
+    )
+    unique_id = secrets.token_hex(4)
     
     return f"{timestamp}_{unique_id}_{name_part}{ext_part}"
 
@@ -82,8 +119,7 @@ def validate_file_type(filename: str) -> bool:
     if not filename:
         return False
     
-    _, ext = os.path.splitext(filename.lower())
-    return ext in settings.ALLOWED_EXTENSIONS
+    return get_file_extension(filename) in settings.ALLOWED_EXTENSIONS
 
 
 def validate_file_size(file_size: int) -> bool:
@@ -129,36 +165,61 @@ def get_file_info(file: UploadFile) -> Tuple[str, int, str]:
 
 async def save_uploaded_file(
     file: UploadFile, 
-    upload_dir: str = settings.UPLOAD_DIR
-) -> Tuple[str, str]:
+    upload_dir: str = settings.UPLOAD_DIR,
+    max_size: int = settings.MAX_UPLOAD_SIZE
+) -> Tuple[str, str, str]:
     """
     アップロードされたファイルを保存
     
+    書き込みと同時にSHA256ハッシュを計算し、保存後の再読み込みを不要にする
+    
     Args:
         file: FastAPIのUploadFileオブジェクト
         upload_dir: 保存先ディレクトリ
+        max_size: 許可する最大サイズ（バイト）。超えた時点で書き込みを中断する
         
     Returns:
-        (保存されたファイルパス, ユニークファイル名)
+        (保存されたファイルパス, ユニークファイル名, SHA256ハッシュ)
         
     Raises:
-        HTTPException: ファイル保存に失敗した場合
+        HTTPException: サイズ超過（413）またはファイル保存に失敗した場合
     """
     try:
-        # アップロードディレクトリの作成
+        # アップロードディレクトリの作成（起動時に作成済みなら何もしない）
+        ensure_directory(upload_dir)
         upload_path = Path(upload_dir)
-        upload_path.mkdir(parents=True, exist_ok=True)
         
         # ユニークなファイル名を生成
         unique_filename = generate_unique_filename(file.filename or "unknown")
         file_path = upload_path / unique_filename
         
-        # ファイルを保存
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        # ファイルを保存（全体をメモリに載せずチャンク単位で書き込む）
+        total = 0
+        hash_obj = hashlib.sha256()
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                
+                # サイズ上限を超えた時点で中断し、書きかけのファイルを削除
+                total += len(chunk)
+                if total > max_size:
+                    break
+                hash_obj.update(chunk)
+                await buffer.write(chunk)
         
-        return str(file_path), unique_filename
+        if total > max_size:
+            delete_file(str(file_path))
+            raise HTTPException(
+                status_code=413,
+                detail=f"ファイルサイズが制限を超えています。最大: {max_size / 1024 / 1024:.1f}MB"
+            )
+        
+        return str(file_path), unique_filename, hash_obj.hexdigest()
+    
+    except HTTPException:
+        raise
     
     except Exception as e:
         raise HTTPException(
@@ -182,7 +243,7 @@ def get_file_mime_type(file_path: str) -> Optional[str]:
         MIMEタイプ文字列、取得できない場合はNone
     """
     try:
-        return magic.from_file(file_path, mime=True)
+        return detect_mime_type(file_path)
     except Exception:
         return None
 
@@ -197,6 +258,8 @@ def delete_file(file_path: str) -> bool:
     Returns:
         削除に成功した場合True
     """
+    invalidate_file_cache(file_path)
+    
     try:
         file_path_obj = Path(file_path)
         if file_path_obj.exists() and file_path_obj.is_file():
@@ -3,14 +3,31 @@ ABDSシステム - 画像処理ユーティリティ
 画像の検証、サムネイル生成、メタデータ取得
 """
 
+import asyncio
+import hashlib
+import multiprocessing
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, Iterable, List
 from PIL import Image, ImageOps
 from PIL.ExifTags import TAGS
-import magic
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 from app.core.config import settings
+from app.utils.file_handler import ensure_directory
+from app.utils.security import (
+    cache_by_file_stat,
+    detect_mime_type,
+    get_file_extension,
+    invalidate_file_cache,
+)
 
 
 # サポートされる画像フォーマット
@@ -22,6 +39,22 @@ SUPPORTED_IMAGE_FORMATS = {
     'WEBP': ['.webp']
 }
 
+# 中間サムネイル（バケット）の長辺サイズ。小さいサムネイルは元画像ではなくバケットから縮小する
+THUMBNAIL_BUCKETS = (256, 512, 1024)
+THUMBNAIL_BUCKET_DIR = "_buckets"
+THUMBNAIL_BUCKET_QUALITY = 95
+
+# 取得するEXIFタグ（MakerNoteや埋め込みサムネイル等の大きなタグはデコードしない）
+EXIF_TAG_WHITELIST = (
+    0x0112,  # Orientation
+    0x0132,  # DateTime
+    0x010F,  # Make
+    0x0110,  # Model
+)
+EXIF_GPS_IFD = 0x8825  # GPSInfo
+EXIF_ORIENTATION = 0x0112
+EXIF_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)  # 回転補正で縦横が入れ替わる値
+
 # 画像のMIMEタイプ
 IMAGE_MIME_TYPES = {
     'image/jpeg': ['.jpg', '.jpeg'],
@@ -32,12 +65,14 @@ IMAGE_MIME_TYPES = {
 }
 
 
-def validate_image_file(file_path: str) -> bool:
+@cache_by_file_stat
+def validate_image_file(file_path: str, strict: bool = False) -> bool:
     """
     ファイルが有効な画像かどうか検証
     
     Args:
         file_path: 検証するファイルのパス
+        strict: Trueの場合はverify()で画像データ全体の整合性も確認
         
     Returns:
         有効な画像ファイルの場合True
@@ -48,15 +83,11 @@ def validate_image_file(file_path: str) -> bool:
             return False
         
         # MIMEタイプ検証
-        mime_type = magic.from_file(file_path, mime=True)
+        mime_type = detect_mime_type(file_path)
         if mime_type not in IMAGE_MIME_TYPES:
             return False
         
-        # PILで画像として開けるか確認
-        with Image.open(file_path) as img:
-            img.verify()  # 画像データの整合性確認
-        
-        # 再度開いて基本情報取得（verifyで壊れるため）
+        # PILで画像として開けるか確認（Image.openはヘッダーのみ読み、画素はデコードしない）
         with Image.open(file_path) as img:
             # 最小サイズチェック
             if img.width < 10 or img.height < 10:
@@ -65,6 +96,10 @@ def validate_image_file(file_path: str) -> bool:
             # 最大サイズチェック
             if img.width > 10000 or img.height > 10000:
                 return False
+            
+            # 画像データの整合性確認（サイズ取得後なので同じハンドルで実行できる）
+            if strict:
+                img.verify()
         
         return True
         
@@ -94,13 +129,18 @@ def get_image_info(file_path: str) -> Optional[Dict[str, Any]]:
                 'has_transparency': img.mode in ('RGBA', 'LA', 'P'),
             }
             
-            # EXIF情報の取得（JPEG画像の場合）
-            if hasattr(img, '_getexif') and img._getexif() is not None:
-                exif_data = {}
-                exif = img._getexif()
-                for tag, value in exif.items():
-                    tag_name = TAGS.get(tag, tag)
-                    exif_data[tag_name] = value
+            # EXIF情報の取得（必要なタグのみ参照し、全タグのデコードは行わない）
+            exif = img.getexif()
+            if exif:
+                exif_data = {
+                    TAGS.get(tag, tag): exif[tag]
+                    for tag in EXIF_TAG_WHITELIST
+                    if tag in exif
+                }
+                if EXIF_GPS_IFD in exif:
+                    gps_info = exif.get_ifd(EXIF_GPS_IFD)
+                    if gps_info:
+                        exif_data[TAGS.get(EXIF_GPS_IFD, EXIF_GPS_IFD)] = dict(gps_info)
                 info['exif'] = exif_data
             
             return info
@@ -130,23 +170,10 @@ def create_thumbnail(
     try:
         # サムネイル保存ディレクトリの作成
         thumbnail_dir = os.path.dirname(thumbnail_path)
-        os.makedirs(thumbnail_dir, exist_ok=True)
+        ensure_directory(thumbnail_dir)
         
-        with Image.open(source_path) as img:
-            # EXIF情報に基づく回転補正
-            img = ImageOps.exif_transpose(img)
-            
-            # RGBモードに変換（透明度を保持しつつJPEG保存のため）
-            if img.mode in ('RGBA', 'LA', 'P'):
-                # 白背景で合成
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-            
+        # 中間サムネイル（バケット）があれば元画像の代わりにそこから縮小
+        with _open_for_thumbnail(source_path, thumbnail_dir, size) as img:
             # アスペクト比を維持してリサイズ
             img.thumbnail(size, Image.Resampling.LANCZOS)
             
@@ -165,6 +192,208 @@ def create_thumbnail(
         return False
 
 
+def _to_rgb(img: Image.Image) -> Image.Image:
+    """EXIF回転補正を適用し、JPEG保存用にRGBへ変換（透明部分は白背景で合成）"""
+    # EXIF情報に基づく回転補正
+    img = ImageOps.exif_transpose(img)
+    
+    # RGBモードに変換（透明度を保持しつつJPEG保存のため）
+    if img.mode == 'P':
+        img = img.convert('RGBA')
+    
+    if img.mode == 'RGBA' and NUMPY_AVAILABLE:
+        # numpyのベクトル演算で白背景とアルファ合成
+        pixels = np.asarray(img)
+        alpha = pixels[..., 3:4].astype(np.float32) * (1 / 255)
+        rgb = pixels[..., :3].astype(np.float32)
+        img = Image.fromarray((rgb * alpha + 255 * (1 - alpha) + 0.5).astype(np.uint8))
+    elif img.mode in ('RGBA', 'LA'):
+        # 白背景で合成
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        # アルファチャンネルのみを取り出す（split()のように全チャンネルを複製しない）
+        background.paste(img, mask=img.getchannel('A'))
+        img = background
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+    
+    return img
+
+
+def _open_as_rgb(source_path: str, max_side: Optional[int] = None) -> Image.Image:
+    """
+    画像を開いてRGBに変換（元ファイルのハンドルは閉じる）
+    
+    Args:
+        source_path: 画像のパス
+        max_side: 縮小後に必要な長辺。JPEGはこのサイズを下回らない範囲で1/2〜1/8スケールでデコードする
+    """
+    with Image.open(source_path) as img:
+        if max_side is not None and img.format == 'JPEG':
+            # libjpegのDCTスケーリングで縮小デコード（EXIF回転前のため縦横とも長辺分を確保）
+            img.draft(None, (max_side, max_side))
+        rgb = _to_rgb(img)
+        rgb.load()
+        return rgb if rgb is not img else rgb.copy()
+
+
+def _select_bucket(size: Tuple[int, int]) -> Optional[int]:
+    """目的サイズの長辺以上で最小のバケットサイズ（該当なしはNone）"""
+    target = max(size)
+    for bucket in THUMBNAIL_BUCKETS:
+        if bucket >= target:
+            return bucket
+    return None
+
+
+def _bucket_path(source_path: str, thumbnail_dir: str, bucket: int) -> str:
+    """元画像に対応するバケットファイルのパス"""
+    digest = hashlib.sha1(os.path.abspath(source_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(thumbnail_dir, THUMBNAIL_BUCKET_DIR, f"{digest}_{bucket}.jpg")
+
+
+def _open_for_thumbnail(source_path: str, thumbnail_dir: str, size: Tuple[int, int]) -> Image.Image:
+    """
+    サムネイルの縮小元となるRGB画像を取得
+    
+    目的サイズ以上で最小のバケットがあればそれを使い、なければ元画像から生成してディスクに保存する。
+    元画像がバケットの2倍未満の場合は縮小の効果が小さいため元画像をそのまま使う
+    """
+    bucket = _select_bucket(size)
+    if bucket is None:
+        return _open_as_rgb(source_path, max(size))
+    
+    bucket_path = _bucket_path(source_path, thumbnail_dir, bucket)
+    
+    # 元画像より新しいバケットがあれば再利用
+    try:
+        if os.path.getmtime(bucket_path) >= os.path.getmtime(source_path):
+            return _open_as_rgb(bucket_path)
+    except OSError:
+        pass
+    
+    # JPEGの縮小デコードは長辺をbucket*2以上に保つ（bucketで指定するとdraftが2倍未満まで縮小し、
+    # 下の判定で常に元画像扱いとなってバケットが保存されないため）
+    img = _open_as_rgb(source_path, bucket * 2)
+    if max(img.size) >= bucket * 2:
+        img.thumbnail((bucket, bucket), Image.Resampling.LANCZOS)
+        ensure_directory(os.path.dirname(bucket_path))
+        img.save(bucket_path, 'JPEG', quality=THUMBNAIL_BUCKET_QUALITY)
+    return img
+
+
+def remove_thumbnail_buckets(image_path: str, thumbnail_dir: Optional[str] = None) -> None:
+    """
+    元画像に対応するバケット画像を削除
+    
+    Args:
+        image_path: 元画像のパス
+        thumbnail_dir: サムネイル保存ディレクトリ（省略時はget_thumbnail_pathと同じ場所）
+    """
+    if thumbnail_dir is None:
+        thumbnail_dir = os.path.dirname(get_thumbnail_path(image_path))
+    
+    for bucket in THUMBNAIL_BUCKETS:
+        try:
+            os.remove(_bucket_path(image_path, thumbnail_dir, bucket))
+        except OSError:
+            pass
+
+
+def _thumbnail_worker(args: Tuple[str, str, Tuple[int, int], int]) -> bool:
+    """プロセスプール用のサムネイル生成（引数をタプルで受け取る）"""
+    return create_thumbnail(*args)
+
+
+# サムネイル生成用のプロセスプール（初回使用時に作成）
+_thumbnail_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _thumbnail_mp_context() -> multiprocessing.context.BaseContext:
+    """
+    ワーカープロセスの起動方式を取得
+    
+    スレッドを持つ実行中のサーバープロセスをforkすると、子プロセスが継承したロックで
+    デッドロックする恐れがあるため、forkserver（利用できない環境ではspawn）を使用する
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _create_thumbnail_executor(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """サムネイル生成用のプロセスプールを作成（workers省略時はsettings.THUMBNAIL_WORKERS）"""
+    return ProcessPoolExecutor(
+        max_workers=workers or settings.THUMBNAIL_WORKERS,
+        mp_context=_thumbnail_mp_context()
+    )
+
+
+def _get_thumbnail_pool() -> ProcessPoolExecutor:
+    """共有プロセスプールを取得"""
+    global _thumbnail_pool
+    if _thumbnail_pool is None:
+        _thumbnail_pool = _create_thumbnail_executor()
+    return _thumbnail_pool
+
+
+def shutdown_thumbnail_pool() -> None:
+    """共有プロセスプールを終了（アプリケーション終了時に呼び出す）"""
+    global _thumbnail_pool
+    if _thumbnail_pool is not None:
+        _thumbnail_pool.shutdown(wait=False, cancel_futures=True)
+        _thumbnail_pool = None
+
+
+async def create_thumbnail_async(
+    source_path: str, 
+    thumbnail_path: str, 
+    size: Tuple[int, int] = (200, 200),
+    quality: int = 85
+) -> bool:
+    """
+    サムネイル画像をプロセスプールで生成（イベントループをブロックしない）
+    
+    Args:
+        source_path: 元画像のパス
+        thumbnail_path: サムネイル保存パス
+        size: サムネイルサイズ (width, height)
+        quality: JPEG品質 (1-100)
+        
+    Returns:
+        サムネイル生成に成功した場合True
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_thumbnail_pool(), _thumbnail_worker, (source_path, thumbnail_path, size, quality)
+    )
+
+
+def create_thumbnails_batch(
+    pairs: Iterable[Tuple[str, str]],
+    size: Tuple[int, int] = (200, 200),
+    quality: int = 85,
+    workers: Optional[int] = None
+) -> List[bool]:
+    """
+    複数画像のサムネイルをプロセスプールで並列生成（一括インポート・再処理用）
+    
+    Args:
+        pairs: (元画像のパス, サムネイル保存パス) の一覧
+        size: サムネイルサイズ (width, height)
+        quality: JPEG品質 (1-100)
+        workers: ワーカープロセス数（Noneの場合はsettings.THUMBNAIL_WORKERS）
+        
+    Returns:
+        各画像のサムネイル生成結果（入力順）
+    """
+    tasks = [(source_path, thumbnail_path, size, quality) for source_path, thumbnail_path in pairs]
+    if not tasks:
+        return []
+    
+    with _create_thumbnail_executor(workers) as executor:
+        return list(executor.map(_thumbnail_worker, tasks, chunksize=8))
+
+
 def get_thumbnail_path(original_path: str, thumbnail_dir: str = "thumbnails") -> str:
     """
     サムネイルのパスを生成
@@ -200,6 +429,9 @@ def cleanup_image_files(image_path: str, thumbnail_path: Optional[str] = None) -
     """
     success = True
     
+    invalidate_file_cache(image_path)
+    remove_thumbnail_buckets(image_path)
+    
     try:
         # 元画像の削除
         if os.path.exists(image_path):
@@ -227,6 +459,10 @@ def resize_image(
     """
     画像をリサイズして保存
     
+    リサイズ不要・出力形式が同じ・GPS位置情報を含まない画像は再エンコードせずにコピーするため、
+    EXIF（撮影日時・機種・MakerNote等）やその他のメタデータは元画像のまま保持される。
+    それ以外は再エンコードし、メタデータは出力しない。
+    
     Args:
         source_path: 元画像のパス
         output_path: 出力パス
@@ -239,15 +475,31 @@ def resize_image(
     """
     try:
         with Image.open(source_path) as img:
+            # 回転補正後のサイズ（ピクセルはデコードせずヘッダーのみ参照）
+            current_width, current_height = img.size
+            exif = img.getexif()
+            if exif.get(EXIF_ORIENTATION) in EXIF_TRANSPOSED_ORIENTATIONS:
+                current_width, current_height = current_height, current_width
+            
+            # リサイズ不要かつ出力形式が同じ場合は再エンコードせずバイト列をそのままコピー
+            # （EXIFの回転情報も保持されるため表示結果は変わらない）。
+            # GPS位置情報を含む場合は漏えいを防ぐため、再エンコードしてメタデータを除去する
+            if (
+                current_width <= max_width and current_height <= max_height
+                and get_file_extension(output_path) in SUPPORTED_IMAGE_FORMATS.get(img.format, ())
+                and EXIF_GPS_IFD not in exif
+            ):
+                if os.path.abspath(source_path) != os.path.abspath(output_path):
+                    shutil.copyfile(source_path, output_path)
+                return True
+            
             # EXIF情報に基づく回転補正
             img = ImageOps.exif_transpose(img)
-            
-            # 現在のサイズ
             current_width, current_height = img.size
             
             # リサイズが必要かチェック
             if current_width <= max_width and current_height <= max_height:
-                # リサイズ不要の場合はコピー
+                # 出力形式が異なる場合・GPS位置情報を含む場合は変換して保存
                 img.save(output_path, quality=quality, optimize=True)
                 return True
             
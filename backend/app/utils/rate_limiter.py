@@ -6,10 +6,10 @@ APIレート制限とリクエスト管理
 import time
 import asyncio
 import logging
+import uuid
 from typing import Dict, Optional
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
-import threading
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +17,16 @@ logger = logging.getLogger(__name__)
 class RateLimiter:
     """
     レート制限機能
-    指定された時間窓内でのリクエスト回数を制限
+    指定された時間窓内でのリクエスト回数を制限（トークンバケット方式）
+    
+    バケット容量はlimit、補充速度はlimit/window（トークン/秒）。
+    状態の更新にawaitを挟まないため、イベントループ上では排他制御なしで不可分に実行される
+    
+    キーごとに大量に生成されるため、__slots__でインスタンスの__dict__を持たずメモリを固定量に抑える
     """
     
+    __slots__ = ('limit', 'window', 'tokens', 'last_refill', '_refill_rate')
+    
     def __init__(self, limit: int, window: int):
         """
         Args:
@@ -28,8 +35,16 @@ class RateLimiter:
         """
         self.limit = limit
         self.window = window
-        self.requests = deque()
-        self.lock = threading.Lock()
+        self.tokens = float(limit)
+        self.last_refill = time.monotonic()
+        self._refill_rate = limit / window if window > 0 else float('inf')
+    
+    def _refill(self, now: float) -> None:
+        """経過時間に応じてトークンを補充"""
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(float(self.limit), self.tokens + elapsed * self._refill_rate)
+            self.last_refill = now
         
     async def acquire(self, key: str = "default") -> bool:
         """
@@ -41,62 +56,62 @@ class RateLimiter:
         Returns:
             許可された場合True、制限に達した場合False
         """
-        current_time = time.time()
+        self._refill(time.monotonic())
         
-        with self.lock:
-            # 時間窓外の古いリクエストを削除
-            while self.requests and self.requests[0] <= current_time - self.window:
-                self.requests.popleft()
-            
-            # 制限チェック
-            if len(self.requests) >= self.limit:
-                next_allowed = self.requests[0] + self.window
-                wait_time = next_allowed - current_time
-                logger.warning(f"レート制限に達しました。{wait_time:.1f}秒後に再試行可能")
-                return False
-            
-            # リクエストを記録
-            self.requests.append(current_time)
-            return True
+        # 制限チェック
+        if self.tokens < 1:
+            wait_time = (1 - self.tokens) / self._refill_rate
+            logger.warning(f"レート制限に達しました。{wait_time:.1f}秒後に再試行可能")
+            return False
+        
+        # リクエストを記録
+        self.tokens -= 1
+        return True
     
     def get_remaining_requests(self) -> int:
         """残りリクエスト数を取得"""
-        current_time = time.time()
-        
-        with self.lock:
-            # 時間窓外の古いリクエストを削除
-            while self.requests and self.requests[0] <= current_time - self.window:
-                self.requests.popleft()
-            
-            return max(0, self.limit - len(self.requests))
+        self._refill(time.monotonic())
+        return max(0, int(self.tokens))
     
     def get_reset_time(self) -> Optional[datetime]:
-        """制限リセット時刻を取得"""
-        if not self.requests:
+        """制限リセット時刻（バケットが満杯に戻る時刻）を取得"""
+        self._refill(time.monotonic())
+        if self.tokens >= self.limit:
             return None
-            
-        with self.lock:
-            oldest_request = self.requests[0]
-            reset_time = oldest_request + self.window
-            return datetime.fromtimestamp(reset_time)
+        
+        seconds_until_full = (self.limit - self.tokens) / self._refill_rate
+        return datetime.now() + timedelta(seconds=seconds_until_full)
 
 
 class GlobalRateLimiter:
     """
     グローバルレート制限機能
     複数のキーに対してレート制限を管理
+    
+    イベントループ上からのみ使用する前提でロックを持たず、
+    保持するキー数はmax_limitersを上限に最も長く使われていないものから破棄する
     """
     
-    def __init__(self):
-        self.limiters: Dict[str, RateLimiter] = {}
-        self.lock = threading.Lock()
+    def __init__(self, max_limiters: int = 10000):
+        """
+        Args:
+            max_limiters: 保持するレート制限機能の最大数
+        """
+        self.max_limiters = max_limiters
+        self.limiters: 'OrderedDict[str, RateLimiter]' = OrderedDict()
     
     def get_limiter(self, key: str, limit: int, window: int) -> RateLimiter:
         """指定されたキーのレート制限機能を取得"""
-        with self.lock:
-            if key not in self.limiters:
-                self.limiters[key] = RateLimiter(limit, window)
-            return self.limiters[key]
+        limiter = self.limiters.get(key)
+        if limiter is not None:
+            self.limiters.move_to_end(key)
+            return limiter
+        
+        limiter = RateLimiter(limit, window)
+        self.limiters[key] = limiter
+        if len(self.limiters) > self.max_limiters:
+            self.limiters.popitem(last=False)
+        return limiter
     
     async def acquire(self, key: str, limit: int, window: int) -> bool:
         """レート制限チェック"""
@@ -159,13 +174,33 @@ class RedisRateLimiter:
     
     async def acquire(self, key: str) -> bool:
         """
-        Redis基盤のレート制限チェック
+        Redis基盤のレート制限チェック（sorted setによるsliding window log方式）
         
-        TODO: 実際のRedis実装
-        - INCR + EXPIRE を使用したカウンター方式
-        - または sliding window log 方式
+        古い記録の削除・今回の記録・件数取得・有効期限設定を1回の往復で実行する
+        
+        Args:
+            key: レート制限のキー（ユーザーIDなど）
+            
+        Returns:
+            許可された場合True、制限に達した場合False
         """
-        # プレースホルダー実装
+        redis_key = f"rate_limit:{key}"
+        now = time.time()
+        member = f"{now}:{uuid.uuid4().hex}"
+        
+        pipe = self.redis.pipeline()
+        pipe.zremrangebyscore(redis_key, 0, now - self.window)
+        pipe.zadd(redis_key, {member: now})
+        pipe.zcard(redis_key)
+        pipe.expire(redis_key, self.window)
+        _, _, count, _ = await pipe.execute()
+        
+        if count > self.limit:
+            # 拒否したリクエストは記録から除外
+            await self.redis.zrem(redis_key, member)
+            logger.warning(f"レート制限に達しました: {key}")
+            return False
+        
         return True
 
 
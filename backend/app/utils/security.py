@@ -3,12 +3,31 @@ ABDSシステム - セキュリティユーティリティ
 ファイルセキュリティ検証、ウイルススキャン、MIMEタイプ検証
 """
 
+import asyncio
+import copy
+import functools
 import os
+import threading
 import magic
 import hashlib
-from typing import Optional, Dict, List
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Dict, List, Tuple
 from pathlib import Path
 
+# libmagicのMIMEタイプ判定器（マジックデータベースの読み込みはプロセスで1回のみ）
+_MIME = magic.Magic(mime=True)
+
+# MIME判定に読み込むファイル先頭のバイト数（画像形式の判定には十分）
+HEADER_SIZE = 4096
+
+# ヘッダーだけでは判定できなかったことを示すMIMEタイプ
+_INCONCLUSIVE_MIME_TYPES = {'application/octet-stream'}
+
+# 検証結果キャッシュ（(関数名, パス, 引数) -> (st_mtime_ns, st_size, 結果)）
+VALIDATION_CACHE_MAXSIZE = 4096
+_validation_cache: 'OrderedDict[Tuple, Tuple[int, int, Any]]' = OrderedDict()
+_validation_cache_lock = threading.Lock()
+
 # ファイル署名（マジックナンバー）による検証
 FILE_SIGNATURES = {
     # 画像形式
@@ -37,19 +56,102 @@ ALLOWED_MIME_TYPES = {
 }
 
 
-def check_file_signature(file_path: str) -> Optional[str]:
+def cache_by_file_stat(func: Callable) -> Callable:
+    """
+    ファイル検証関数の結果を(パス, 更新時刻, サイズ)でキャッシュするデコレーター
+    
+    ファイルが変更されるとst_mtime_ns/st_sizeが変わるため、古い結果は使われない
+    """
+    @functools.wraps(func)
+    def wrapper(file_path: str, *args, **kwargs):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return func(file_path, *args, **kwargs)
+        
+        key = (func.__name__, file_path, args, tuple(sorted(kwargs.items())))
+        with _validation_cache_lock:
+            cached = _validation_cache.get(key)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                _validation_cache.move_to_end(key)
+                return copy.deepcopy(cached[2])
+        
+        result = func(file_path, *args, **kwargs)
+        
+        with _validation_cache_lock:
+            _validation_cache[key] = (stat.st_mtime_ns, stat.st_size, copy.deepcopy(result))
+            _validation_cache.move_to_end(key)
+            while len(_validation_cache) > VALIDATION_CACHE_MAXSIZE:
+                _validation_cache.popitem(last=False)
+        return result
+    
+    return wrapper
+
+
+def invalidate_file_cache(file_path: str) -> None:
+    """
+    指定パスの検証結果キャッシュを破棄（ファイル削除時に使用）
+    
+    Args:
+        file_path: 対象ファイルのパス
+    """
+    with _validation_cache_lock:
+        for key in [key for key in _validation_cache if key[1] == file_path]:
+            del _validation_cache[key]
+
+
+def read_file_header(file_path: str, size: int = HEADER_SIZE) -> bytes:
+    """
+    ファイル先頭のバイト列を読み込む
+    
+    Args:
+        file_path: 読み込むファイルのパス
+        size: 読み込むバイト数
+        
+    Returns:
+        先頭のバイト列
+    """
+    with open(file_path, 'rb') as f:
+        return f.read(size)
+
+
+def detect_mime_type(file_path: str, header: Optional[bytes] = None) -> str:
+    """
+    libmagicでファイルの実際のMIMEタイプを検出
+    
+    先頭バイト列から判定し、判定できない場合のみファイル全体で再判定する
+    
+    Args:
+        file_path: 検出するファイルのパス
+        header: 読み込み済みの先頭バイト列（省略時は読み込む）
+        
+    Returns:
+        MIMEタイプ文字列
+    """
+    if header is None:
+        header = read_file_header(file_path)
+    
+    mime_type = _MIME.from_buffer(header)
+    if mime_type in _INCONCLUSIVE_MIME_TYPES and len(header) >= HEADER_SIZE:
+        mime_type = _MIME.from_file(file_path)
+    return mime_type
+
+
+def check_file_signature(file_path: str, header: Optional[bytes] = None) -> Optional[str]:
     """
     ファイルの署名（マジックナンバー）をチェック
     
     Args:
         file_path: チェックするファイルのパス
+        header: 読み込み済みの先頭バイト列（省略時は最初の16バイトを読む）
         
     Returns:
         検出されたMIMEタイプ、検出できない場合はNone
     """
     try:
-        with open(file_path, 'rb') as f:
-            file_header = f.read(16)  # 最初の16バイトを読む
+        if header is None:
+            header = read_file_header(file_path, 16)
+        file_header = header[:16]
         
         for signature, mime_type in FILE_SIGNATURES.items():
             if file_header.startswith(signature):
@@ -61,20 +163,30 @@ def check_file_signature(file_path: str) -> Optional[str]:
         return None
 
 
-def validate_mime_type(file_path: str, declared_mime_type: Optional[str] = None) -> bool:
+@cache_by_file_stat
+def validate_mime_type(
+    file_path: str,
+    declared_mime_type: Optional[str] = None,
+    header: Optional[bytes] = None
+) -> bool:
     """
     MIMEタイプの検証
     
     Args:
         file_path: 検証するファイルのパス
         declared_mime_type: 宣言されたMIMEタイプ
+        header: 読み込み済みの先頭バイト列（省略時は読み込む）
         
     Returns:
         有効なMIMEタイプの場合True
     """
     try:
+        # 先頭バイト列を1回だけ読み込み、libmagicと署名チェックで共有
+        if header is None:
+            header = read_file_header(file_path)
+        
         # libmagicを使用した実際のMIMEタイプ検出
-        actual_mime_type = magic.from_file(file_path, mime=True)
+        actual_mime_type = detect_mime_type(file_path, header)
         
         # 許可されたMIMEタイプかチェック
         if actual_mime_type not in ALLOWED_MIME_TYPES:
@@ -96,7 +208,7 @@ def validate_mime_type(file_path: str, declared_mime_type: Optional[str] = None)
                 return False
         
         # ファイル署名による二重チェック
-        signature_mime = check_file_signature(file_path)
+        signature_mime = check_file_signature(file_path, header)
         if signature_mime and signature_mime != actual_mime_type:
             # 署名とlibmagicの結果が異なる場合は疑わしい
             return False
@@ -107,6 +219,22 @@ def validate_mime_type(file_path: str, declared_mime_type: Optional[str] = None)
         return False
 
 
+def get_file_extension(filename: str) -> str:
+    """
+    ファイル名から小文字の拡張子（'.'付き）を取得
+    
+    os.path.splitextと同様に先頭のピリオドは拡張子とみなさない
+    
+    Args:
+        filename: ファイル名
+        
+    Returns:
+        拡張子、存在しない場合は空文字
+    """
+    index = filename.rfind('.')
+    return filename[index:].lower() if index > 0 else ''
+
+
 def check_dangerous_extension(filename: str) -> bool:
     """
     危険なファイル拡張子のチェック
@@ -120,10 +248,7 @@ def check_dangerous_extension(filename: str) -> bool:
     if not filename:
         return True
     
-    # 拡張子を取得して小文字に変換
-    _, ext = os.path.splitext(filename.lower())
-    
-    return ext in DANGEROUS_EXTENSIONS
+    return get_file_extension(filename) in DANGEROUS_EXTENSIONS
 
 
 def calculate_file_hash(file_path: str, algorithm: str = 'sha256') -> Optional[str]:
@@ -138,19 +263,22 @@ def calculate_file_hash(file_path: str, algorithm: str = 'sha256') -> Optional[s
         ハッシュ値、計算できない場合はNone
     """
     try:
-        hash_obj = hashlib.new(algorithm)
-        
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            # Python 3.11以降はGILを解放したままOpenSSLでファイル全体を処理
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, algorithm).hexdigest()
+            
+            hash_obj = hashlib.new(algorithm)
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
                 hash_obj.update(chunk)
-        
-        return hash_obj.hexdigest()
+            return hash_obj.hexdigest()
         
     except Exception:
         return None
 
 
-def scan_file_for_virus(file_path: str) -> Dict[str, any]:
+@cache_by_file_stat
+def scan_file_for_virus(file_path: str, file_hash: Optional[str] = None) -> Dict[str, any]:
     """
     ウイルススキャンの実行
     
@@ -160,6 +288,7 @@ def scan_file_for_virus(file_path: str) -> Dict[str, any]:
     
     Args:
         file_path: スキャンするファイルのパス
+        file_hash: 計算済みのSHA256ハッシュ（指定時はファイルを再読み込みしない）
         
     Returns:
         スキャン結果の辞書
@@ -181,7 +310,7 @@ def scan_file_for_virus(file_path: str) -> Dict[str, any]:
         'threats_found': [],
         'scan_engine': 'placeholder',
         'scan_time': 0.0,
-        'file_hash': calculate_file_hash(file_path),
+        'file_hash': file_hash or calculate_file_hash(file_path),
         'message': 'プレースホルダー実装: 実際のウイルススキャンが必要です'
     }
     
@@ -195,12 +324,16 @@ def scan_file_for_virus(file_path: str) -> Dict[str, any]:
     return result
 
 
-def validate_file_content(file_path: str) -> Dict[str, any]:
+async def validate_file_content(file_path: str, file_hash: Optional[str] = None) -> Dict[str, any]:
     """
     ファイル内容の包括的な検証
     
+    MIMEタイプ検証・拡張子チェック・ウイルススキャン・ハッシュ計算は互いに独立しているため、
+    スレッドで並行実行してイベントループをブロックしない
+    
     Args:
         file_path: 検証するファイルのパス
+        file_hash: 保存時に計算済みのSHA256ハッシュ（指定時はハッシュ計算を省略）
         
     Returns:
         検証結果の辞書
@@ -228,27 +361,35 @@ def validate_file_content(file_path: str) -> Dict[str, any]:
             result['errors'].append('ファイルが空です')
             return result
         
+        filename = os.path.basename(file_path)
+        if file_hash is None:
+            file_hash = await asyncio.to_thread(calculate_file_hash, file_path)
+        
+        mime_valid, dangerous, virus_scan = await asyncio.gather(
+            asyncio.to_thread(validate_mime_type, file_path),
+            asyncio.to_thread(check_dangerous_extension, filename),
+            asyncio.to_thread(scan_file_for_virus, file_path, file_hash=file_hash),
+        )
+        
         # MIMEタイプ検証
-        if not validate_mime_type(file_path):
+        if not mime_valid:
             result['valid'] = False
             result['errors'].append('不正なMIMEタイプです')
         
         # 危険な拡張子チェック
-        filename = os.path.basename(file_path)
-        if check_dangerous_extension(filename):
+        if dangerous:
             result['valid'] = False
             result['errors'].append('危険なファイル拡張子です')
         
         # ウイルススキャン
-        virus_scan = scan_file_for_virus(file_path)
         result['virus_scan'] = virus_scan
         
         if not virus_scan['clean']:
             result['valid'] = False
             result['errors'].append('ウイルスまたは脅威が検出されました')
         
-        # ファイルハッシュ計算
-        result['file_info']['hash'] = calculate_file_hash(file_path)
+        # ファイルハッシュ
+        result['file_info']['hash'] = file_hash
         
     except Exception as e:
         result['valid'] = False
@@ -257,6 +398,10 @@ def validate_file_content(file_path: str) -> Dict[str, any]:
     return result
 
 
+# アップロード先として許可しないシステムディレクトリ
+SYSTEM_DIRECTORIES = ('/bin', '/sbin', '/etc', '/sys', '/proc', '/root')
+
+
 def sanitize_upload_directory(upload_dir: str) -> bool:
     """
     アップロードディレクトリのセキュリティチェック
@@ -268,17 +413,15 @@ def sanitize_upload_directory(upload_dir: str) -> bool:
         安全な場合True
     """
     try:
-        upload_path = Path(upload_dir).resolve()
+        raw_path = Path(upload_dir)
         
-        # 相対パス攻撃の防止
-        if '..' in str(upload_path):
+        # 相対パス攻撃の防止（resolve()後は'..'が消えるため、解決前のパスで判定）
+        if '..' in raw_path.parts:
             return False
         
         # システムディレクトリへのアクセス防止
-        system_dirs = ['/bin', '/sbin', '/etc', '/sys', '/proc', '/root']
-        for sys_dir in system_dirs:
-            if str(upload_path).startswith(sys_dir):
-                return False
+        if str(raw_path.resolve()).startswith(SYSTEM_DIRECTORIES):
+            return False
         
         return True
         
@@ -0,0 +1,94 @@
+"""
+SerpAPISearchService の非同期一括検索（投入→アーカイブのポーリング）のテスト
+"""
+
+import json
+import re
+
+import httpx
+import pytest
+
+from app.services.image_search import SerpAPISearchService
+
+
+# SerpAPIが返す完全なレスポンス（json_restrictorで絞り込む前）
+_SUBMIT_RESPONSE = {
+    "search_metadata": {"id": "search-123", "status": "Processing"},
+    "search_parameters": {"engine": "google_reverse_image"},
+}
+_ARCHIVE_RESPONSE = {
+    "search_metadata": {"id": "search-123", "status": "Success"},
+    "search_parameters": {"engine": "google_reverse_image"},
+    "inline_images": [{
+        "title": "inline",
+        "original": "https://example.com/a.jpg",
+        "thumbnail": "https://example.com/a_thumb.jpg",
+        "source": "https://example.com/page",
+        "original_width": 800,
+        "original_height": 600,
+    }],
+    "visual_matches": [{
+        "title": "match",
+        "link": "https://example.org/b",
+        "thumbnail": "https://example.org/b_thumb.jpg",
+        "source": "https://example.org",
+    }],
+}
+_FAILED_RESPONSE = {
+    "search_metadata": {"id": "search-123", "status": "Error"},
+    "error": "Google hasn't returned any results for this query.",
+}
+
+
+def _restrict(response: dict, restrictor: str) -> dict:
+    """json_restrictorのトップレベルのフィールドのみを残す（SerpAPIの絞り込みを模擬）"""
+    fields = {
+        name.strip().rstrip('[]')
+        for name in re.sub(r'\{[^}]*\}', '', restrictor).split(',')
+    }
+    return {key: value for key, value in response.items() if key in fields}
+
+
+def _make_service(archive_response: dict) -> SerpAPISearchService:
+    def handler(request: httpx.Request) -> httpx.Response:
+        restrictor = request.url.params["json_restrictor"]
+        if request.url.path == "/search.json":
+            assert request.url.params["async"] == "true"
+            body = _restrict(_SUBMIT_RESPONSE, restrictor)
+        else:
+            assert request.url.path == "/searches/search-123.json"
+            body = _restrict(archive_response, restrictor)
+        return httpx.Response(200, content=json.dumps(body).encode())
+
+    service = SerpAPISearchService(api_key="test-key")
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service.BATCH_POLL_INTERVAL = 0
+    return service
+
+
+@pytest.mark.asyncio
+async def test_search_batch_submits_and_polls_with_restricted_responses():
+    service = _make_service(_ARCHIVE_RESPONSE)
+    try:
+        results = await service.search_batch(["https://example.com/query.jpg"], max_results=10)
+    finally:
+        await service.aclose()
+
+    assert len(results) == 1
+    assert not isinstance(results[0], Exception)
+    assert [result.url for result in results[0]] == [
+        "https://example.com/a.jpg",
+        "https://example.org/b",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_batch_reports_serpapi_error_message():
+    service = _make_service(_FAILED_RESPONSE)
+    try:
+        results = await service.search_batch(["https://example.com/query.jpg"], max_results=10)
+    finally:
+        await service.aclose()
+
+    assert isinstance(results[0], Exception)
+    assert "Google hasn't returned any results" in str(results[0])
@@ -0,0 +1,127 @@
+"""
+ThreatScorer のバッチ計算とスカラー計算の一致テスト
+"""
+
+import random
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.threat_scorer import NUMPY_AVAILABLE, ThreatScorer
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+
+def _iso_days_ago(days: int, now_epoch: float) -> str:
+    """days日前（日境界から半日ずらした時刻）のISO文字列"""
+    return datetime.fromtimestamp(now_epoch - (days + 0.5) * 86400, timezone.utc).isoformat()
+
+
+def _random_social_data(rng: random.Random) -> dict:
+    """シェア数の合計がしきい値（10/100/1000）の前後に分布するソーシャルデータ"""
+    if rng.random() < 0.2:
+        return {}
+    keys = ('facebook_shares', 'twitter_shares', 'linkedin_shares')
+    return {
+        key: rng.choice([0, 3, 10, 11, 45, 100, 101, 450, 1000, 1001, rng.randint(0, 5000)])
+        for key in rng.sample(keys, rng.randint(1, len(keys)))
+    }
+
+
+def _random_record(rng: random.Random, now_epoch: float) -> dict:
+    """サブスコアが小数になるよう信頼度・ベンダー評価を乱数で与えたレコード"""
+    levels = ['high', 'medium', 'low', '']
+    return {
+        'domain_data': {
+            'creation_date': _iso_days_ago(rng.randint(0, 4000), now_epoch),
+            'ssl_info': rng.choice([
+                {},
+                {'has_ssl': False},
+                {'has_ssl': True, 'is_valid': False},
+                {'has_ssl': True, 'is_valid': True, 'issuer': "Let's Encrypt"},
+                {'has_ssl': True, 'is_valid': True, 'issuer': 'Unknown CA'},
+            ]),
+            'whois_info': rng.choice([
+                {},
+                {'registrant': {'organization': 'Example', 'country': 'JP'}},
+                {'privacy_protected': True},
+            ]),
+            'dns_records': rng.choice([
+                {},
+                {'mx_records': ['mx.example.com'], 'txt_records': ['v=spf1 -all']},
+            ]),
+            'reputation': {
+                'vendor_assessments': {
+                    f'vendor{i}': rng.uniform(0, 100) for i in range(rng.randint(1, 5))
+                }
+            },
+        },
+        'ai_analysis': {
+            'abuse_detection': {'risk_level': rng.choice(levels), 'confidence': rng.random()},
+            'copyright_infringement': {'probability': rng.choice(levels), 'confidence': rng.random()},
+            'commercial_use': {'status': rng.choice(['unauthorized', 'commercial', 'personal'])},
+            'content_modification': {'level': rng.choice(['major', 'minor', 'none'])},
+        },
+        'search_data': {
+            'ranking': rng.randint(0, 120),
+            'traffic_estimate': rng.choice([{}, {'alexa_rank': rng.randint(1, 2_000_000)}]),
+        },
+        'content_data': {
+            'similarity_score': rng.random(),
+            'last_updated': _iso_days_ago(rng.randint(0, 800), now_epoch),
+            'social_data': _random_social_data(rng),
+        },
+    }
+
+
+def _without_timestamp(result: dict) -> dict:
+    return {key: value for key, value in result.items() if key != 'calculated_at'}
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy is not installed")
+def test_batch_matches_scalar_on_random_records():
+    rng = random.Random(20240101)
+    now_epoch = time.time()
+    records = [_random_record(rng, now_epoch) for _ in range(5000)]
+    scorer = ThreatScorer()
+
+    batch = scorer.calculate_scores_batch(records, strict=True)
+    scalar = [
+        scorer.calculate_score(
+            record['domain_data'], record['ai_analysis'],
+            record['search_data'], record['content_data'],
+            strict=True
+        )
+        for record in records
+    ]
+
+    assert [_without_timestamp(r) for r in batch] == [_without_timestamp(r) for r in scalar]
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy is not installed")
+def test_numpy_aggregation_is_bitwise_equal_to_scalar_combiner():
+    rng = np.random.default_rng(20240101)
+    n = 10000
+    scorer = ThreatScorer()
+    domain_static = rng.uniform(0, 100, (n, 4))
+    ai_subs = rng.uniform(0, 100, (n, 4))
+
+    # 数値特徴量は欠損扱いにして、区分線形のサブスコアを既知の値に固定する
+    missing = np.full(n, np.nan)
+    zeros = np.zeros(n)
+    no_data = np.zeros(n, dtype=bool)
+    weight_vecs = (scorer._top_w_vec, scorer._domain_w_vec, scorer._ai_w_vec, scorer._other_w_vec)
+    aggregated = np.column_stack(scorer._aggregate_numpy(
+        missing, missing, zeros, zeros, no_data, zeros, no_data, zeros,
+        domain_static, ai_subs, weight_vecs
+    ))
+
+    other_subs = (50.0, scorer._score_content_similarity(0.0), 60.0, 50.0, 50.0)
+    expected = np.array([
+        scorer._combine_scores((50.0, *domain_static[i]), tuple(ai_subs[i]), other_subs)
+        for i in range(n)
+    ])
+
+    assert np.array_equal(aggregated, expected)